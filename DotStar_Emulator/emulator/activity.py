@@ -0,0 +1,86 @@
+"""
+Activity of each LED, how often its value changed over the last received frames, and how many of the received
+pixel bytes repeat the pixel already shown.  Updated by the data reader with a few vectorized passes per frame.
+"""
+import numpy
+
+from DotStar_Emulator.emulator.stats import RingBuffer
+
+__all__ = ["ActivityTracker", ]
+
+
+class ActivityTracker(object):
+
+    def __init__(self, pixel_count, window):
+        """
+        Count the changes of each LED over a sliding window of received frames.  Every frame is compared to the one
+        before it, the LEDs that changed are kept for each frame of the window and taken off the counts again when
+        the frame leaves the window.
+
+        There is no lock, only the data reader should observe.  The main loop may read the counts while a frame is
+        observed, and see the counts of a frame that is half taken off.
+
+        :param pixel_count: `int` number of pixels in the strip
+        :param window: `int` number of received frames the changes are counted over
+        :return:
+        """
+
+        self.pixel_count = pixel_count
+        self.window = max(1, window)
+
+        self.counts = numpy.zeros(pixel_count, dtype=numpy.uint32)  # changes of each LED inside the window
+        self.frame_count = 0  # total number of frames observed
+        self.redundant_bytes = RingBuffer(self.window)  # pixel bytes of each frame that repeat the previous frame
+        self.redundant_bytes_total = 0
+        self.pixel_bytes_total = 0  # pixel bytes of every observed frame, the start and end frames left out
+
+        self._previous = numpy.zeros(pixel_count, dtype=numpy.uint32)  # pixels of the last observed frame
+        self._changed = numpy.zeros((self.window, pixel_count), dtype=bool)  # LEDs changed by each frame
+        self._first = True
+
+    @property
+    def frames(self):
+        """
+        :return: `int` number of frames inside the window
+        """
+
+        return min(self.frame_count, self.window)
+
+    def observe(self, words, sent):
+        """
+        Count the LEDs a received frame changed.  The very first frame only sets the pixels to compare against.
+
+        :param words: numpy uint32 array of the strip pixels after the frame, one per pixel
+        :param sent: `int` number of pixels the frame held, the pixels after it were not sent and are not compared
+        :return: None
+        """
+
+        sent = max(0, min(sent, self.pixel_count))
+        if self._first:
+            self._previous[:sent] = words[:sent]
+            self._first = False
+            return
+
+        changed = self._changed[self.frame_count % self.window]
+        self.counts -= changed
+        numpy.not_equal(words[:sent], self._previous[:sent], out=changed[:sent])
+        changed[sent:] = False
+        self.counts += changed
+        self._previous[:sent] = words[:sent]
+
+        redundant = (sent - int(numpy.count_nonzero(changed[:sent]))) * 4
+        self.redundant_bytes.append(redundant)
+        self.redundant_bytes_total += redundant
+        self.pixel_bytes_total += sent * 4
+        self.frame_count += 1
+
+    def levels(self, indexes):
+        """
+        Activity of LEDs as a level, 255 for an LED that changed with every frame of the window.
+
+        :param indexes: numpy array of pixel indexes, of any shape
+        :return: numpy uint8 array the shape of indexes
+        """
+
+        frames = max(1, self.frames)
+        return numpy.minimum(self.counts.take(indexes) * 255 // frames, 255).astype(numpy.uint8)
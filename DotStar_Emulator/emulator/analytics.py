@@ -0,0 +1,121 @@
+"""
+Frame analytics, the estimated power draw and the brightness histogram of the received frames.  Computed on its own
+thread from the received messages, so neither the data reader nor the main loop pays for them.
+"""
+import threading
+import logging
+
+import numpy
+
+from DotStar_Emulator.emulator import config
+from DotStar_Emulator.emulator.color_lut import apply_brightness, color_order_channels
+from DotStar_Emulator.emulator.stats import RingBuffer
+
+log = logging.getLogger("data")
+
+__all__ = ["FrameAnalytics", ]
+
+
+class FrameAnalytics(threading.Thread):
+
+    def __init__(self, pixel_count):
+        """
+        Estimate the current drawn by each received frame, and the histogram of its LED brightness, in its own
+        thread.  Only the newest frame is kept waiting, frames received while one is analyzed are skipped.
+
+        The current of an LED is POWER_IDLE_MA, plus POWER_CHANNEL_MA of each color scaled by its value and the
+        global brightness.  Frames over POWER_BUDGET_MA are counted and logged.
+
+        There is no lock, the results are replaced whole and may be read from any thread.
+
+        :param pixel_count: `int` number of pixels in the strip
+        :return:
+        """
+
+        super(FrameAnalytics, self).__init__()
+        self.daemon = True
+
+        self.pixel_count = pixel_count
+        self.idle_ma = config.get("POWER_IDLE_MA")
+        self.budget_ma = config.get("POWER_BUDGET_MA")
+        self.bins = config.get("BRIGHTNESS_BINS")
+
+        # mA of each color byte of a pixel at 255, from the red, green, blue POWER_CHANNEL_MA in COLOR_ORDER
+        self.byte_ma = numpy.zeros(3)
+        for color, channel in enumerate(color_order_channels(config.get("COLOR_ORDER"))):
+            self.byte_ma[channel - 1] = config.get("POWER_CHANNEL_MA")[color]
+
+        self.power = RingBuffer(config.get("POWER_SAMPLES"))  # mA of the last analyzed frames
+        self.last_ma = None  # mA of the last analyzed frame
+        self.peak_ma = 0.0  # highest mA of any analyzed frame
+        self.histogram = numpy.zeros(self.bins, dtype=numpy.intp)  # LEDs in each brightness bin, last frame
+        self.frames_analyzed = 0
+        self.frames_over_budget = 0
+        self.over_budget = False  # last analyzed frame was over POWER_BUDGET_MA
+
+        self.running = True
+        self._pending = None  # newest received message waiting to be analyzed
+        self._event = threading.Event()
+
+    def submit(self, msg):
+        """
+        Hand a received frame to the analytics thread, replacing any frame still waiting.  Called from the data
+        reader, msg must not be changed afterwards.
+
+        :param msg: bytearray of the received frame, start frame included
+        :return: None
+        """
+
+        self._pending = msg
+        self._event.set()
+
+    def run(self):
+        """
+        Analyze the newest submitted frame until stop is called.
+
+        :return: None
+        """
+
+        while self.running:
+            if not self._event.wait(0.1):
+                continue
+            self._event.clear()
+            msg, self._pending = self._pending, None
+            if msg is not None:
+                self.analyze(msg)
+
+    def stop(self):
+        self.running = False
+
+    def analyze(self, msg):
+        """
+        Estimate the current and brightness histogram of a frame, with vectorized reductions over its pixels.
+
+        :param msg: bytearray of the received frame, start frame included
+        :return: None
+        """
+
+        count = min(max(len(msg) - 4, 0) // 4, self.pixel_count)
+        channels = numpy.frombuffer(msg, dtype=numpy.uint8, count=count * 4, offset=4).reshape(-1, 4).copy() \
+            if count else numpy.zeros((0, 4), dtype=numpy.uint8)
+        apply_brightness(channels)
+        colors = channels[:, 1:]
+
+        ma = float(numpy.dot(colors.sum(axis=0, dtype=numpy.uint64), self.byte_ma)) / 255.0 + \
+            self.idle_ma * self.pixel_count
+
+        # Brightness of an LED is its brightest color
+        brightness = colors.max(axis=1)
+        self.histogram = numpy.bincount(brightness.astype(numpy.intp) * self.bins >> 8, minlength=self.bins)
+
+        self.power.append(ma)
+        self.last_ma = ma
+        self.peak_ma = max(self.peak_ma, ma)
+        self.frames_analyzed += 1
+
+        over_budget = bool(self.budget_ma) and ma > self.budget_ma
+        if over_budget:
+            self.frames_over_budget += 1
+            if not self.over_budget:
+                log.warning("Estimated power draw of %.0f mA is over POWER_BUDGET_MA of %s mA", ma, self.budget_ma)
+        self.over_budget = over_budget
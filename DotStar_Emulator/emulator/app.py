@@ -15,15 +15,22 @@ from .utils import vector2_to_int
 from .scenes.running import RunningScene
 from .scenes.about import AboutScene
 from . import globals
-from .data import StripData, MappingData, TCPReader
-from .rate_counter import RateCounter
+from .data import StripData, MappingData, TCPReader, DATA_EVENT
 from .utils import MEDIA_PATH
+from .stats import RingBuffer, Histogram, perf_counter
+from .metrics import MetricsServer
+from .governor import QualityGovernor, QUALITY_REDUCED_RATE
+from .analytics import FrameAnalytics
 
 
-pygame.init()
-
 log = logging.getLogger("app")
 
+# Stages of the main loop that are timed, in the order they run.
+STAGES = ("events", "update", "strip_update", "draw", "flip", "total")
+
+# Histogram bucket upper bounds, in seconds, of the time taken to draw the scene
+RENDER_BUCKETS = (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+
 
 def configure_logging():
     logging.config.dictConfig(config.get("LOGGING"))
@@ -31,18 +38,36 @@ def configure_logging():
 
 class EmulatorApp(object):
 
-    def __init__(self):
+    def __init__(self, headless=False, render=True, read_config=True, metrics_port=None):
         """
         Main Emulator Application Class, runs the pygame Loop.
 
+        When headless is set no window is opened.  SDL is pointed at its dummy video driver so the emulator runs
+        on machines without a display, and if render is also set the scene is drawn to an offscreen surface.
+        Otherwise only the data reader and strip_data are run.
+
+        :param headless: `bool`, default=False, run without a window
+        :param render: `bool`, default=True, render the scene, offscreen when headless
+        :param read_config: `bool`, default=True, read the users config.py.  False when the configuration has
+                            already been set, as the benchmarks do.
+        :param metrics_port: `int`, default=None, serve metrics on this port, overrides METRICS_PORT
         :return:
         """
 
+        self.headless = headless
+        self.render = render
+
+        if self.headless:
+            os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+            os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+        pygame.init()
+
         # Set reference to self as current_app
         globals.current_app = self
 
         # Configure
-        found_user_config = config.read_configuration()
+        found_user_config = config.read_configuration() if read_config else False
 
         # Setup any logging configurations
         configure_logging()
@@ -50,18 +75,45 @@ class EmulatorApp(object):
         if found_user_config:
             log.info("Found user config file")
 
-        # Create pygame window
+        if metrics_port is not None:
+            config.set("METRICS_PORT", metrics_port)
+
+        # Create pygame window, or an offscreen surface when running headless
         self.window_size = Vector2(config.get("WINDOW_SIZE"))
         self.window_caption = config.get("WINDOW_CAPTION")
-        log.info("Creating window at %s resolution", self.window_size)
-        full_screen = pygame.FULLSCREEN if config.get("FULL_SCREEN") else 0
-        self.screen = pygame.display.set_mode(vector2_to_int(self.window_size),
-                                              pygame.DOUBLEBUF | pygame.HWSURFACE | full_screen)
-        pygame.display.set_caption(self.window_caption)
+        if not self.headless:
+            log.info("Creating window at %s resolution", self.window_size)
+            full_screen = pygame.FULLSCREEN if config.get("FULL_SCREEN") else 0
+            self.screen = pygame.display.set_mode(vector2_to_int(self.window_size),
+                                                  pygame.DOUBLEBUF | pygame.HWSURFACE | full_screen)
+            pygame.display.set_caption(self.window_caption)
+        elif self.render:
+            log.info("Running headless, rendering offscreen at %s resolution", self.window_size)
+            self.screen = pygame.Surface(vector2_to_int(self.window_size))
+        else:
+            log.info("Running headless, rendering disabled")
+            self.screen = None
 
         # Setup pygame clock
         self.clock = pygame.time.Clock()
-        self.fps_limit = 60  # easily set/change the fps limit with this variable
+        self.fps_limit = config.get("DISPLAY_FPS")  # easily set/change the fps limit with this variable
+
+        # Event driven main loop, block on the event queue and only draw when something changed.  There are no
+        # events to wait for when headless, and pygame 1.9 can not wait with a timeout.
+        self.event_loop = bool(config.get("EVENT_LOOP")) and not self.headless
+        if self.event_loop and pygame.version.vernum < (2, 0, 1):
+            log.warning("EVENT_LOOP needs pygame 2.0.1 or newer, drawing at the FPS rate instead")
+            self.event_loop = False
+        self.event_timeout = int(config.get("EVENT_LOOP_TIMEOUT"))
+
+        # Render quality is stepped down when drawing the scene takes longer than the frame budget.  Not when
+        # headless, the benchmarks measure the full quality.
+        self.governor = QualityGovernor(bool(config.get("QUALITY_GOVERNOR")) and not self.headless)
+        self.rate_divisor = 1  # the FPS limit is divided by this at QUALITY_REDUCED_RATE
+
+        # Only the changed parts of the window are drawn and updated.  SDL 1.2 double buffered hardware surfaces
+        # do not keep the last frame, so pygame 1.9 always draws and flips the whole window.
+        self.dirty_rects = pygame.version.vernum[0] >= 2
 
         # current scene to display
         self.scene = None
@@ -72,28 +124,53 @@ class EmulatorApp(object):
         # Keep track if data has been read so we can trigger update
         self._data_read = False
 
+        # Headless statistics, logged every HEADLESS_STATS_INTERVAL seconds
+        self.stats_interval = config.get("HEADLESS_STATS_INTERVAL") * 1000
+        self._stats_elapsed = 0
+        self._stats_frames = 0
+        self._stats_bytes = 0
+        self._stats_rendered = 0
+        self._stats_not_displayed = 0
+        self.frames_rendered = 0
+
+        # Seconds taken by each stage of the main loop, for the last TIMING_SAMPLES iterations
+        self.timings = dict((stage, RingBuffer(config.get("TIMING_SAMPLES"))) for stage in STAGES)
+        self.render_histogram = Histogram(RENDER_BUCKETS)
+
+        # store signals
+        self._event_keydown = blinker.signal("event.keydown")
+        self._event_mousedown = blinker.signal("event.mousebuttondown")
+        self._event_mousemotion = blinker.signal("event.mousemotion")
+
         # subscribe to signals
         blinker.signal("event.keydown").connect(self.on_F4, sender=pygame.K_F4)
         blinker.signal("app.exit").connect(self.on_exit)
         blinker.signal("app.fps").connect(self.on_fps)
         blinker.signal("app.setscene").connect(self.on_setscene)
+        blinker.signal("quality.level").connect(self.on_quality)
 
         # set references to data models
         # Mapping needs to be first, so strip_data can determine number of pixels needed
         globals.mapping_data = MappingData()
         globals.strip_data = StripData()
 
+        # Power draw and brightness of the received frames, analyzed on their own thread once started
+        self.analytics = FrameAnalytics(globals.strip_data.pixel_count) if config.get("FRAME_ANALYTICS") else None
+        globals.strip_data.analytics = self.analytics
+
         # Stored fonts
         self.fonts = {}
 
-        # Create running scene
-        self.build_initial_scene()
+        # Create running scene, there is nothing to draw it to when headless without rendering
+        if self.screen is not None:
+            self.build_initial_scene()
 
         # Create Data Reader
         self.data_reader = TCPReader()
+        self.data_reader.post_events = self.event_loop
 
-        # Create Rate Counter
-        self.rate_counter = RateCounter()
+        # Metrics endpoint is created on start, if METRICS_PORT is set
+        self.metrics_server = None
 
     def on_fps(self, sender, fps):
         """
@@ -107,6 +184,36 @@ class EmulatorApp(object):
         self.fps_limit = fps
         log.info("FPS limit set to %s", fps)
 
+    def on_quality(self, sender, level):
+        """
+        Callback for the quality.level blinker event.  Halve the display rate at QUALITY_REDUCED_RATE.
+
+        :param sender: blinker sender
+        :param level: `int` quality level
+        :return: None
+        """
+
+        self.rate_divisor = 2 if level >= QUALITY_REDUCED_RATE else 1
+
+    def display_fps(self):
+        """
+        :return: `int` FPS the clock is limited to, 0 for no limit
+        """
+
+        if not self.fps_limit:
+            return 0
+        return max(1, self.fps_limit // self.rate_divisor)
+
+    def frame_budget(self):
+        """
+        :return: `float` seconds available to draw a frame at the FPS limit, DISPLAY_FPS when there is no limit
+        """
+
+        fps = self.fps_limit
+        if not 0 < fps <= config.get("DISPLAY_FPS"):
+            fps = config.get("DISPLAY_FPS")
+        return 1.0 / fps
+
     def on_exit(self, sender):
         """
         Callback for app.exit blinker event.  Stop the main loop from running.
@@ -171,80 +278,228 @@ class EmulatorApp(object):
         if scene_name == "running":
             self.scene = RunningScene()
 
-    def run(self):
+    def log_stats(self, elapsed):
+        """
+        Log the ingest and render throughput every HEADLESS_STATS_INTERVAL seconds.  Used when running headless
+        where there is no RunningInfo to look at.
+
+        :param elapsed: milliseconds of pygame clock since last call
+        :return: None
+        """
+
+        self._stats_elapsed += elapsed
+        if self._stats_elapsed < self.stats_interval:
+            return
+
+        strip_data = globals.strip_data
+        seconds = self._stats_elapsed / 1000.0
+        frames = strip_data.frame_count - self._stats_frames
+        data_bytes = strip_data.byte_count - self._stats_bytes
+        rendered = self.frames_rendered - self._stats_rendered
+        not_displayed = strip_data.frames_not_displayed - self._stats_not_displayed
+
+        log.info("Received %s frames (%.1f/s), %s bytes (%.1f KB/s), rendered %s frames (%.1f/s), "
+                 "%s frames not displayed",
+                 frames, frames / seconds, data_bytes, data_bytes / seconds / 1024.0, rendered, rendered / seconds,
+                 not_displayed)
+        log.info("Average ms, %s", ", ".join("{} {:.3f}".format(stage, (self.timings[stage].mean() or 0) * 1000.0)
+                                             for stage in STAGES))
+
+        self._stats_elapsed = 0
+        self._stats_frames = strip_data.frame_count
+        self._stats_bytes = strip_data.byte_count
+        self._stats_rendered = self.frames_rendered
+        self._stats_not_displayed = strip_data.frames_not_displayed
+
+    def wait_events(self):
+        """
+        Block until there is a pygame event or EVENT_LOOP_TIMEOUT has passed.  Does not block if the scene is
+        already waiting to be drawn.
+
+        :return: `list` of pygame events
+        """
+
+        if self.scene is None or not self.scene.needs_redraw:
+            event = pygame.event.wait(self.event_timeout)
+            if event.type != pygame.NOEVENT:
+                return [event] + pygame.event.get()
+        return pygame.event.get()
+
+    def process_events(self, events=None):
+        """
+        Turn the pending pygame events into blinker signals.
+
+        :param events: `list` of pygame events, default None gets the pending events from the queue
+        :return: None
+        """
+
+        if events is None:
+            events = pygame.event.get()
+
+        for event in events:
+            if event.type == pygame.QUIT:
+                self.running = False
+            # A frame was published by the data reader, strip_data.update will pick it up
+            if event.type == DATA_EVENT:
+                self.data_reader.event_pending = False
+            # Window contents were lost, draw everything again
+            if event.type == pygame.VIDEOEXPOSE and self.scene:
+                self.scene.request_redraw()
+            # Turn keydown events into blinker signals
+            if event.type == pygame.KEYDOWN:
+
+                # Find pygame.constants.K_? reference. This is needed because blinker uses id(sender) in order
+                # to hash the sender.  This doesn't work with integers -5 through 256 because python will create
+                # a new object every time for other numbers.  Only the K_ names are looked at, pygame 2 scancode
+                # constants share their values and would send the signal twice for one key press.
+                for d in dir(constants):
+                    if d.startswith("K_") and constants.__dict__[d] == event.key:
+                        self._event_keydown.send(constants.__dict__[d], event=event)
+                        break
+
+            # Turn mousebuttondown events into blinker signals
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                self._event_mousedown.send(event.button, event=event)
+
+            if event.type == pygame.MOUSEMOTION:
+                self._event_mousemotion.send(None, event=event)
+
+    def start(self):
+        """
+        Start the data reader thread, the frame analytics thread, and the metrics server if configured.
+
+        :return: `bool` True if the data reader was able to bind to its socket.
+        """
 
-        # Start Threads
         self.data_reader.start()
         self.data_reader.startup.wait()
         if not self.data_reader.startup_success:
-            return
+            return False
 
-        self.rate_counter.start()
+        if self.analytics:
+            self.analytics.start()
 
-        # store signals
-        event_keydown = blinker.signal("event.keydown")
-        event_mousedown = blinker.signal("event.mousebuttondown")
-        event_mousemotion = blinker.signal("event.mousemotion")
-
-        try:
+        if config.get("METRICS_PORT"):
+            try:
+                self.metrics_server = MetricsServer(config.get("METRICS_HOST"), config.get("METRICS_PORT"))
+                self.metrics_server.start()
+            except (IOError, OSError):
+                log.exception("Could not bind metrics socket '%s', %s", config.get("METRICS_HOST"),
+                              config.get("METRICS_PORT"))
+        return True
 
-            while self.running:
+    def stop(self):
+        """
+        Signal the data reader and frame analytics threads to stop, and stop serving metrics.
 
-                if self._data_read:
-                    blinker.signal("stripdata.updated").send(None)
-                    self._data_read = False
+        :return: None
+        """
 
-                elapsed = self.clock.tick(self.fps_limit)
+        self.data_reader.stop()
+        if self.analytics:
+            self.analytics.stop()
+        if self.metrics_server:
+            self.metrics_server.stop()
+            self.metrics_server = None
 
-                # Process Events
-                for event in pygame.event.get():
-                    if event.type == pygame.QUIT:
-                        self.running = False
-                    # Turn keydown events into blinker signals
-                    if event.type == pygame.KEYDOWN:
+    def join(self):
+        """
+        Wait for the data reader and frame analytics threads to exit.
 
-                        # Find pygame.constants.K_? reference. This is needed because blinker uses id(sender) in order
-                        # to hash the sender.  This doesn't work with integers -5 through 256 because python will create
-                        # a new object every time for other numbers.
-                        for d in dir(constants):
-                            if constants.__dict__[d] == event.key:
-                                event_keydown.send(constants.__dict__[d], event=event)
+        :return: None
+        """
 
-                    # Turn mousebuttondown events into blinker signals
-                    if event.type == pygame.MOUSEBUTTONDOWN:
-                        event_mousedown.send(event.button, event=event)
+        if self.data_reader.is_alive():
+            self.data_reader.join()
+        if self.analytics and self.analytics.is_alive():
+            self.analytics.join()
 
-                    if event.type == pygame.MOUSEMOTION:
-                        event_mousemotion.send(None, event=event)
+    def step(self):
+        """
+        Run a single iteration of the main loop.
 
-                # Update things that care
-                if self.scene:
-                    self.scene.update(elapsed)
-                globals.strip_data.update(elapsed)
+        :return: None
+        """
 
-                # Time to Render the Screen!
+        if self._data_read:
+            blinker.signal("stripdata.updated").send(None)
+            self._data_read = False
+
+        # Idle until a frame is received or the user does something.  The wait is not part of the timings.
+        events = self.wait_events() if self.event_loop else None
+
+        elapsed = self.clock.tick(self.display_fps())
+        timings = self.timings
+        start = perf_counter()
+
+        # Process Events, there are none without a window
+        if not self.headless:
+            self.process_events(events)
+        t_events = perf_counter()
+        timings["events"].append(t_events - start)
+
+        # Update things that care
+        if self.scene:
+            self.scene.update(elapsed)
+        t_update = perf_counter()
+        timings["update"].append(t_update - t_events)
+
+        globals.strip_data.update(elapsed)
+        t_strip = perf_counter()
+        timings["strip_update"].append(t_strip - t_update)
+
+        # Time to Render the Screen!  Only when the scene has changed, a loop that has nothing new to show costs
+        # the events and update stages only.
+        if self.screen is not None and (self.scene is None or self.scene.needs_redraw):
+            rects = None
+            if self.scene:
+                if not self.dirty_rects:
+                    self.scene.request_redraw()
+                rects = self.scene.on_draw(self.screen)
+            else:
                 self.screen.fill((0, 0, 0))
+            t_draw = perf_counter()
+            timings["draw"].append(t_draw - t_strip)
+            self.render_histogram.observe(t_draw - t_strip)
+
+            if not self.headless:
+                if rects is None:
+                    pygame.display.flip()
+                else:
+                    pygame.display.update(rects)
+            self.frames_rendered += 1
+            t_flip = perf_counter()
+            timings["flip"].append(t_flip - t_draw)
+            self.governor.observe(t_flip - t_strip, self.frame_budget())
 
-                if self.scene:
-                    self.scene.on_draw(self.screen)
+        timings["total"].append(perf_counter() - start)
 
-                pygame.display.flip()
+        if self.headless:
+            self.log_stats(elapsed)
+
+    def run(self):
+
+        # Start Threads
+        if not self.start():
+            return
+
+        try:
+
+            while self.running:
+                self.step()
 
         except KeyboardInterrupt:
             pass
         except:
             # Stop threads
-            self.data_reader.stop()
-            self.rate_counter.stop()
+            self.stop()
             # re-raise
             exc_info = sys.exc_info()
             reraise(exc_info[0], exc_info[1], exc_info[2])
 
         # Stop and Join threads
-        self.data_reader.stop()
-        self.rate_counter.stop()
-        self.rate_counter.join()
-        self.data_reader.join()
+        self.stop()
+        self.join()
 
         # Not really needed, but its in most pygame examples.. hmmm.
         sys.exit()
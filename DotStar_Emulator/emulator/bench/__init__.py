@@ -0,0 +1,29 @@
+"""
+Benchmarks, run with manage.py bench
+"""
+import sys
+
+from DotStar_Emulator.emulator import config
+from .end_to_end import run_end_to_end, run_worker
+from .micro import run_micro
+
+
+def start_bench_app(arguments):
+    """
+    Run the end to end or micro benchmarks, or a single end to end case when started as a worker process.
+
+    :param arguments: argparse Namespace
+    :return: None
+    """
+
+    if arguments.worker:
+        run_worker(arguments.transport[0], arguments.grid[0], arguments.duration, arguments.rate)
+        return
+
+    config.read_configuration()
+    if arguments.micro:
+        arguments.output = arguments.output or "bench_micro.json"
+        sys.exit(run_micro(arguments))
+    else:
+        arguments.output = arguments.output or "bench.json"
+        sys.exit(run_end_to_end(arguments))
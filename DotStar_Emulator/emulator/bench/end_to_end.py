@@ -0,0 +1,416 @@
+"""
+End to end benchmark, drive a headless emulator with synthetic frames over each transport.
+
+Every grid size and transport combination is run in its own worker process, so the peak RSS of one case does not
+leak into the next.  The worker prints its result as a single line of JSON to stdout.
+"""
+from __future__ import print_function
+
+import argparse
+import json
+import logging
+import socket
+import subprocess
+import sys
+import threading
+import time
+from array import array
+from multiprocessing.connection import Client
+
+from DotStar_Emulator.emulator import config, globals
+from DotStar_Emulator.emulator.app import EmulatorApp
+from DotStar_Emulator.emulator.vector2 import Vector2
+from DotStar_Emulator.emulator.stats import perf_counter, percentile
+from .report import new_report, write_report, read_report, compare_reports
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+log = logging.getLogger("bench")
+
+__all__ = ["GRID_SIZES", "TRANSPORTS", "run_end_to_end", "run_worker", "configure_grid", ]
+
+GRID_SIZES = ((8, 8), (64, 64), (256, 256), (1024, 1024))
+
+# metric name: True if higher is better
+METRICS = {
+    "ingest_fps": True,
+    "render_ms.mean": False,
+    "render_ms.p99": False,
+    "latency_ms.p50": False,
+    "latency_ms.p99": False,
+    "peak_rss_mb": False,
+}
+
+
+class TCPTransport(object):
+
+    name = "tcp"
+
+    def __init__(self, host, port):
+        """
+        Send frames the same way the spoofed Adafruit_DotStar library does, over a multiprocessing Client.
+
+        :param host: `str` emulator host
+        :param port: `int` emulator port
+        :return:
+        """
+
+        self.connection = Client((host, port))
+
+    def send(self, frame):
+        self.connection.send(frame)
+
+    def close(self):
+        self.connection.close()
+
+
+TRANSPORTS = {
+    TCPTransport.name: TCPTransport,
+}
+
+
+# Send times kept for the latency, a frame not displayed within this many newer frames is forgotten
+SENT_AT_SLOTS = 4096
+
+
+class FrameSender(threading.Thread):
+
+    def __init__(self, transport, pixel_count, rate=None, record=False):
+        """
+        Thread to send synthetic frames as fast as possible, or at a fixed rate.
+
+        The first pixel of each frame holds a 24 bit sequence number.  When recording, the time each frame was sent
+        is kept in a ring of SENT_AT_SLOTS slots, so it can be looked up when the frame is displayed.  Every other
+        pixel alternates between two colors, so each frame changes the whole strip and is repainted in full.
+
+        :param transport: connected transport instance
+        :param pixel_count: `int` number of pixels in each frame
+        :param rate: `float` frames per second, None to send as fast as possible
+        :param record: `bool` keep the send times, for the latency
+        :return:
+        """
+
+        super(FrameSender, self).__init__()
+        self.daemon = True
+
+        self.transport = transport
+        self.rate = rate
+        self.running = True
+
+        self.sequence = 0
+        self.record = record
+        # perf_counter time each frame was sent, and its sequence number, slot sequence % SENT_AT_SLOTS
+        self.sent_at = array("d", [0.0]) * SENT_AT_SLOTS
+        self.sent_sequence = array("l", [-1]) * SENT_AT_SLOTS
+
+        # start frame, pixels, end frame
+        footer_length = (pixel_count + 15) // 16
+        self.frame = bytearray(4) + bytearray((0xFF, 0x40, 0x80, 0xC0)) * pixel_count
+        self.frame += bytearray((0xFF, )) * footer_length
+        # Pixels of even and odd frames, every color byte differs between the two
+        self.pixels = (bytes(bytearray((0xFF, 0x40, 0x80, 0xC0)) * pixel_count),
+                       bytes(bytearray((0xFF, 0xC0, 0x40, 0x80)) * pixel_count))
+
+    def run(self):
+        interval = 1.0 / self.rate if self.rate else 0
+        next_send = perf_counter()
+        while self.running:
+            if interval:
+                delay = next_send - perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+                next_send += interval
+
+            self.sequence = (self.sequence + 1) & 0xFFFFFF
+            pixels = self.pixels[self.sequence & 1]
+            self.frame[4:4 + len(pixels)] = pixels
+            self.frame[5] = self.sequence & 0xFF
+            self.frame[6] = (self.sequence >> 8) & 0xFF
+            self.frame[7] = (self.sequence >> 16) & 0xFF
+            if self.record:
+                slot = self.sequence % SENT_AT_SLOTS
+                self.sent_at[slot] = perf_counter()
+                self.sent_sequence[slot] = self.sequence
+            try:
+                self.transport.send(self.frame)
+            except (IOError, EOFError):
+                break
+
+    def stop(self):
+        self.running = False
+
+    def take_sent_at(self, sequence):
+        """
+        Look up the time a frame was sent, and forget it so each frame is matched once.
+
+        :param sequence: `int` sequence number of the frame
+        :return: `float` perf_counter time the frame was sent, None if it was not recorded or is too old
+        """
+
+        slot = sequence % SENT_AT_SLOTS
+        if self.sent_sequence[slot] != sequence:
+            return None
+        self.sent_sequence[slot] = -1
+        return self.sent_at[slot]
+
+
+def displayed_sequence():
+    """
+    :return: `int` sequence number held in the first pixel of the emulators strip_data
+    """
+
+    c, b, g, r = globals.strip_data.get(0)
+    return b | (g << 8) | (r << 16)
+
+
+def peak_rss_mb():
+    """
+    :return: `float` peak resident set size of this process in MB, None if it can not be determined
+    """
+
+    if resource is None:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports in kilobytes, OS X in bytes
+    if sys.platform == "darwin":
+        rss /= 1024.0
+    return rss / 1024.0
+
+
+def free_port(host):
+    """
+    :param host: `str` host to bind to
+    :return: `int` a currently unused port number
+    """
+
+    s = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    try:
+        s.bind((host, 0))
+        return s.getsockname()[1]
+    finally:
+        s.close()
+
+
+def configure_grid(grid_size):
+    """
+    Configure the emulator for a benchmark grid size.  The window is sized so each LED cell is large enough to fit
+    its borders, which lets any grid size be rendered offscreen.
+
+    :param grid_size: (columns, rows)
+    :return: None
+    """
+
+    border_size = Vector2(config.get("BORDER_SIZE"))
+    perimeter_size = Vector2(config.get("PERIMETER_BORDER_SIZE"))
+    cell = 2 + (max(border_size.x, border_size.y) * 2)
+    window_x = grid_size[0] * cell + (perimeter_size.x * 2) + 10 - config.get("EMU_RUNNING_MIN_RIGHT_COL_WIDTH")
+    window_y = grid_size[1] * cell + (perimeter_size.y * 2) + 10
+    default_size = config.get("WINDOW_SIZE")
+
+    config.set("GRID_SIZE", grid_size)
+    config.set("PIXEL_MAPPING", None)
+    config.set("WINDOW_SIZE", (max(default_size[0], int(window_x)), max(default_size[1], int(window_y))))
+
+
+def summary(values, scale=1000.0):
+    """
+    :param values: `list` of seconds
+    :param scale: multiplier applied to each value, default converts to milliseconds
+    :return: `dict` of mean and percentiles
+    """
+
+    if not values:
+        return None
+    values = [v * scale for v in values]
+    return {
+        "mean": sum(values) / len(values),
+        "p50": percentile(values, 50),
+        "p90": percentile(values, 90),
+        "p99": percentile(values, 99),
+        "max": max(values),
+    }
+
+
+def run_phase(app, sender, duration, render_times, latencies):
+    """
+    Step the emulator main loop for duration seconds while the sender is running.
+
+    :param app: started EmulatorApp
+    :param sender: FrameSender, started by this function
+    :param duration: `float` seconds
+    :param render_times: `list` appended with the draw stage seconds of each main loop step that displayed new data
+    :param latencies: `list` appended with seconds from a frame being sent to it being displayed, or None
+    :return: `int` number of frames received during the phase
+    """
+
+    strip_data = globals.strip_data
+    start_count = strip_data.frame_count
+    last_count = start_count
+    last_sequence = None
+    draw_timings = app.timings["draw"]
+    draw_count = draw_timings.count
+
+    sender.start()
+    end = perf_counter() + duration
+    while perf_counter() < end:
+        frame_count = strip_data.frame_count
+        sequence = displayed_sequence()
+
+        app.step()
+        done = perf_counter()
+        # Steps that did not draw have not displayed the new data yet
+        draws, draw_count = draw_timings.since(draw_count)
+
+        if frame_count != last_count and draws:
+            last_count = frame_count
+            render_times.extend(draws)
+            if latencies is not None and sequence != last_sequence:
+                sent_at = sender.take_sent_at(sequence)
+                if sent_at is not None:
+                    latencies.append(done - sent_at)
+                    last_sequence = sequence
+
+    sender.stop()
+    sender.join()
+    return strip_data.frame_count - start_count
+
+
+def run_worker(transport_name, grid_size, duration, rate):
+    """
+    Run a single benchmark case in this process and print the result as JSON.
+
+    The first half of the duration floods the emulator to measure ingest throughput, the second half sends at
+    a fixed rate to measure end to end latency without queueing in the socket.
+
+    :param transport_name: `str` key of TRANSPORTS
+    :param grid_size: (columns, rows)
+    :param duration: `float` seconds for the whole case
+    :param rate: `float` frames per second sent during the latency phase
+    :return: None
+    """
+
+    config.read_configuration()
+    configure_grid(grid_size)
+    config.set("PORT", free_port(config.get("HOST")))
+
+    t = perf_counter()
+    app = EmulatorApp(headless=True, render=True, read_config=False)
+    startup_time = perf_counter() - t
+    app.fps_limit = 0
+
+    if not app.start():
+        raise Exception("Emulator could not bind to port {}".format(config.get("PORT")))
+
+    pixel_count = globals.strip_data.pixel_count
+    transport = TRANSPORTS[transport_name](config.get("HOST"), config.get("PORT"))
+    try:
+        render_times = []
+        latencies = []
+
+        received = run_phase(app, FrameSender(transport, pixel_count), duration / 2.0, render_times, None)
+        ingest_fps = received / (duration / 2.0)
+
+        # Let any queued frames drain before measuring latency
+        time.sleep(0.5)
+        app.step()
+
+        run_phase(app, FrameSender(transport, pixel_count, rate, record=True), duration / 2.0, render_times,
+                  latencies)
+    finally:
+        transport.close()
+        app.stop()
+        app.join()
+
+    result = {
+        "transport": transport_name,
+        "grid_size": list(grid_size),
+        "pixel_count": pixel_count,
+        "startup_ms": startup_time * 1000.0,
+        "ingest_fps": ingest_fps,
+        "render_ms": summary(render_times),
+        "latency_ms": summary(latencies),
+        "frames_displayed": len(render_times),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+    print(json.dumps(result))
+
+
+def parse_grid_size(text):
+    """
+    Argument type of the --grid option.
+
+    :param text: `str` grid size as "columns x rows", example "64x64"
+    :return: (columns, rows)
+    """
+
+    try:
+        columns, rows = text.lower().split("x")
+        return int(columns), int(rows)
+    except ValueError:
+        raise argparse.ArgumentTypeError("invalid grid size '{}', expected COLUMNSxROWS".format(text))
+
+
+def result_key(result):
+    return result["transport"], tuple(result["grid_size"])
+
+
+def run_end_to_end(arguments):
+    """
+    Run every requested grid size and transport in a worker process, write the JSON report and optionally compare
+    it against a baseline report.
+
+    :param arguments: argparse Namespace
+    :return: `int` exit status, 1 if a regression was found
+    """
+
+    grid_sizes = arguments.grid if arguments.grid else GRID_SIZES
+    transports = arguments.transport if arguments.transport else sorted(TRANSPORTS.keys())
+
+    # Read the baseline first, --output may name the same file
+    baseline = read_report(arguments.compare) if arguments.compare else None
+
+    report = new_report("end_to_end")
+    report["duration"] = arguments.duration
+    report["rate"] = arguments.rate
+
+    for transport_name in transports:
+        for grid_size in grid_sizes:
+            print("Running {} {}x{} ...".format(transport_name, grid_size[0], grid_size[1]))
+            cmd = [sys.executable, "-m", "DotStar_Emulator", "bench", "--worker",
+                   "--transport", transport_name,
+                   "--grid", "{}x{}".format(*grid_size),
+                   "--duration", str(arguments.duration),
+                   "--rate", str(arguments.rate)]
+            process = subprocess.Popen(cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+            out, err = process.communicate()
+            lines = out.decode("utf-8").strip().splitlines()
+            if process.returncode != 0 or not lines:
+                print(err.decode("utf-8"))
+                print("  failed, exit status {}".format(process.returncode))
+                continue
+
+            result = json.loads(lines[-1])
+            report["results"].append(result)
+
+            render_ms = result["render_ms"] or {}
+            latency_ms = result["latency_ms"] or {}
+            print("  ingest {:.1f} frames/s, render {:.2f} ms/frame, latency p50 {:.2f} ms p99 {:.2f} ms, "
+                  "peak rss {:.1f} MB".format(result["ingest_fps"], render_ms.get("mean", 0),
+                                              latency_ms.get("p50", 0), latency_ms.get("p99", 0),
+                                              result["peak_rss_mb"] or 0))
+
+    write_report(report, arguments.output)
+    print("Report written to '{}'".format(arguments.output))
+
+    if arguments.compare:
+        regressions = compare_reports(baseline, report, METRICS, result_key, arguments.tolerance)
+        for key, metric, old, new in regressions:
+            print("REGRESSION {} {}x{} {}: {:.3f} -> {:.3f}".format(key[0], key[1][0], key[1][1], metric, old, new))
+        if regressions:
+            return 1
+        print("No regressions against '{}'".format(arguments.compare))
+
+    return 0
@@ -0,0 +1,384 @@
+"""
+Micro benchmarks of the emulator hot paths, run with manage.py bench --micro
+
+Each benchmark is run for every requested pixel count, so the cost of a change to any hot loop shows up as a
+change in the stored JSON baseline.
+"""
+from __future__ import print_function
+
+import argparse
+import logging
+import math
+import timeit
+
+import numpy
+
+from DotStar_Emulator.emulator import config, globals
+from DotStar_Emulator.emulator.activity import ActivityTracker
+from DotStar_Emulator.emulator.app import EmulatorApp
+from DotStar_Emulator.emulator.exposure import ExposureBuffer
+from DotStar_Emulator.emulator.color_lut import apply_brightness
+from DotStar_Emulator.emulator.data import MappingData
+from DotStar_Emulator.emulator.send_test_data import RandomBlendApp, RandomColorApp, FillApp
+from DotStar_Emulator.pi import Adafruit_DotStar
+from .end_to_end import configure_grid
+from .report import new_report, write_report, read_report, compare_reports
+
+__all__ = ["PIXEL_COUNTS", "BENCHMARKS", "run_micro", ]
+
+PIXEL_COUNTS = (64, 1024, 16384)
+
+# metric name: True if higher is better
+METRICS = {
+    "best_us": False,
+}
+
+# Registered benchmark functions, in the order they are run
+BENCHMARKS = []
+
+
+def benchmark(name):
+    """
+    Decorator to register a benchmark.  The decorated function is called with the current EmulatorApp and returns
+    a list of (params, callable) pairs, each callable is timed separately.
+
+    :param name: `str` name of the benchmark
+    :return: decorator
+    """
+
+    def decorator(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return decorator
+
+
+def spi_frame(pixel_count):
+    """
+    :param pixel_count: `int`
+    :return: bytearray of a full frame, start frame, pixels and end frame
+    """
+
+    return bytearray(4) + bytearray((0xFF, 0x40, 0x80, 0xC0)) * pixel_count + \
+        bytearray((0xFF, )) * ((pixel_count + 15) // 16)
+
+
+@benchmark("strip_data.spi_recv")
+def bench_spi_recv(app):
+    strip_data = globals.strip_data
+    msg = spi_frame(strip_data.pixel_count)
+
+    def build(validate):
+        def run():
+            strip_data.validate = validate
+            strip_data.spi_recv(msg)
+        return run
+
+    # A good frame, the validation of it is the cost every client pays
+    return [({"validate": False}, build(False)), ({"validate": True}, build(True))]
+
+
+@benchmark("activity.observe")
+def bench_activity_observe(app):
+    pixel_count = globals.strip_data.pixel_count
+    tracker = ActivityTracker(pixel_count, config.get("ACTIVITY_WINDOW"))
+
+    def build(changed):
+        # Every frame alternates the first changed fraction of the pixels
+        frames = [numpy.zeros(pixel_count, dtype=numpy.uint32), numpy.zeros(pixel_count, dtype=numpy.uint32)]
+        frames[1][:int(pixel_count * changed)] = 1
+        state = {"frame": 0}
+
+        def run():
+            state["frame"] ^= 1
+            tracker.observe(frames[state["frame"]], pixel_count)
+        return run
+
+    return [({"changed": "0%"}, build(0.0)), ({"changed": "100%"}, build(1.0))]
+
+
+@benchmark("exposure.observe")
+def bench_exposure_observe(app):
+    strip_data = globals.strip_data
+    exposure = ExposureBuffer(strip_data.pixel_count, strip_data.rgb_channels, config.get("EXPOSURE_TIME"))
+
+    def build(levels):
+        pixels = strip_data.pixel_bytes().copy()
+        pixels[:, 0] = levels
+        state = {"now": 0.0}
+
+        def run():
+            # Frames 1 ms apart
+            state["now"] += 0.001
+            exposure.observe(pixels, state["now"])
+        return run
+
+    # Every pixel at full brightness skips the per LED scaling
+    levels = 0xE0 | (numpy.arange(strip_data.pixel_count) % 32)
+    return [({"levels": "full"}, build(0xFF)), ({"levels": "mixed"}, build(levels))]
+
+
+@benchmark("strip_data.changed_pixels")
+def bench_changed_pixels(app):
+    strip_data = globals.strip_data
+
+    def run():
+        strip_data.data[1] ^= 0xFF
+        strip_data.changed_pixels()
+    return [({}, run)]
+
+
+@benchmark("strip_data.clear_data")
+def bench_clear_data(app):
+    return [({}, globals.strip_data.clear_data)]
+
+
+@benchmark("strip_data.get_many")
+def bench_get_many(app):
+    strip_data = globals.strip_data
+    indexes = numpy.arange(0, strip_data.pixel_count, 4)
+    return [({"pixels": "1/4"}, lambda: strip_data.get_many(indexes))]
+
+
+@benchmark("mapping_data.init")
+def bench_mapping_data(app):
+    def build(pattern, zero_location):
+        def run():
+            config.set("PATTERN", pattern)
+            config.set("ZERO_LOCATION", zero_location)
+            MappingData()
+        return run
+
+    return [({"pattern": p, "zero_location": z}, build(p, z)) for p in range(4) for z in range(4)]
+
+
+@benchmark("dotgrid.on_render")
+def bench_dotgrid_on_render(app):
+    dotgrid = app.scene.dotgrid
+    dotgrid.render()
+
+    def build(draw_indexes):
+        def run():
+            # A full render of new data
+            dotgrid.draw_indexes = draw_indexes
+            dotgrid.led_layer_stale = True
+            dotgrid.on_render()
+        return run
+
+    return [({"draw_indexes": 0}, build(0)), ({"draw_indexes": 1}, build(1))]
+
+
+@benchmark("dotgrid.on_data_updated")
+def bench_dotgrid_on_data_updated(app):
+    dotgrid = app.scene.dotgrid
+    strip_data = globals.strip_data
+    dotgrid.render()
+    strip_data.changed_pixels()
+
+    def run():
+        # Change a single LED, then throw away the dirty rect the dotgrid passed up
+        strip_data.data[1] ^= 0xFF
+        dotgrid.on_data_updated(None)
+        del app.scene.dirty_rects[:]
+    return [({"changed": 1}, run)]
+
+
+@benchmark("dotgrid.update_led_layer")
+def bench_dotgrid_update_led_layer(app):
+    return [({}, app.scene.dotgrid.update_led_layer)]
+
+
+@benchmark("dotgrid.on_drawborders")
+def bench_dotgrid_on_drawborders(app):
+    dotgrid = app.scene.dotgrid
+
+    def build(values):
+        state = {"i": 0}
+
+        def run():
+            # Flip between the two values, then throw away the dirty rect the dotgrid passed up
+            state["i"] ^= 1
+            dotgrid.on_drawborders(None, values[state["i"]])
+            del app.scene.dirty_rects[:]
+        return run
+
+    return [({"change": "color"}, build((1, 2))), ({"change": "layout"}, build((0, 1)))]
+
+
+@benchmark("dotgrid.create_index_layer")
+def bench_dotgrid_create_index_layer(app):
+    dotgrid = app.scene.dotgrid
+    dotgrid.draw_indexes = 1
+    return [({}, dotgrid.create_index_layer)]
+
+
+@benchmark("dotgrid.cell_at")
+def bench_dotgrid_cell_at(app):
+    dotgrid = app.scene.dotgrid
+    pos = dotgrid.grid_rect(int(dotgrid.grid_size.x) - 1, int(dotgrid.grid_size.y) - 1).center
+    return [({}, lambda: dotgrid.cell_at(pos))]
+
+
+@benchmark("dotgrid.aggregate_blocks")
+def bench_dotgrid_aggregate_blocks(app):
+    dotgrid = app.scene.dotgrid
+    channels = globals.strip_data.pixel_bytes().reshape(int(dotgrid.grid_size.x), -1, 4)
+
+    def build(block, aggregate):
+        return lambda: dotgrid.aggregate_blocks(channels, block, aggregate)
+
+    return [({"block": b, "aggregate": a}, build(b, a)) for b in (2, 8) for a in ("mean", "max")]
+
+
+@benchmark("color_lut.apply_brightness")
+def bench_apply_brightness(app):
+    pixels = globals.strip_data.pixel_bytes()
+
+    def build(levels):
+        def run():
+            # Scale a copy, the copy is part of the cost of visible_colors too
+            channels = pixels.copy()
+            channels[:, 0] = levels
+            apply_brightness(channels)
+        return run
+
+    # Every pixel at full brightness takes the fast path, mixed levels are scaled
+    levels = 0xE0 | (numpy.arange(len(pixels)) % 32)
+    return [({"levels": "full"}, build(0xFF)), ({"levels": "mixed"}, build(levels))]
+
+
+@benchmark("dotgrid.initialize_grid")
+def bench_dotgrid_initialize_grid(app):
+    return [({}, app.scene.dotgrid.initialize_grid)]
+
+
+@benchmark("dotgrid.pan")
+def bench_dotgrid_pan(app):
+    dotgrid = app.scene.dotgrid
+    dotgrid.zoom_at(dotgrid.max_zoom(), (0, 0))
+    state = {"i": 0}
+
+    def run():
+        # Move the view back and forth by one grid cell, then throw away the dirty rect the dotgrid passed up
+        state["i"] ^= 1
+        dotgrid.pan(dotgrid.cell_size.x if state["i"] else -dotgrid.cell_size.x, 0)
+        del app.scene.dirty_rects[:]
+    return [({}, run)]
+
+
+@benchmark("dotstar.show")
+def bench_dotstar_show(app):
+    def build(brightness):
+        strip = Adafruit_DotStar(globals.strip_data.pixel_count)
+        strip.setBrightness(brightness)
+        # Stop the sending thread, and throw away each queued frame
+        strip._data_thread.stop()
+        strip._data_thread.join()
+        queue = strip._data_thread.queue
+
+        def run():
+            strip.show()
+            queue.get_nowait()
+        return run
+
+    return [({"brightness": 0}, build(0)), ({"brightness": 64}, build(64))]
+
+
+@benchmark("send_test_data.fill")
+def bench_send_test_data(app):
+    args = argparse.Namespace(rate=None, loop=None, fill="(0, 0, 0)")
+    rblend = RandomBlendApp(args)
+    rand = RandomColorApp(args)
+    fill = FillApp(args)
+    return [
+        ({"app": "rblend"}, rblend.fill_dummy),
+        ({"app": "rand"}, rand.fill_dummy),
+        ({"app": "fill"}, lambda: fill.fill(0x10, 0x20, 0x30)),
+    ]
+
+
+def time_callable(func, min_time, repeat):
+    """
+    Time func, calling it enough times per repeat to take at least min_time seconds.
+
+    :param func: callable taking no arguments
+    :param min_time: `float` minimum seconds for each repeat
+    :param repeat: `int` number of repeats
+    :return: (best seconds per call, mean seconds per call, number of calls per repeat)
+    """
+
+    timer = timeit.Timer(func)
+    number = 1
+    while True:
+        elapsed = timer.timeit(number)
+        if elapsed >= min_time or number >= 1 << 20:
+            break
+        number *= 2 if elapsed <= 0 else max(2, int(math.ceil(min_time / elapsed)))
+
+    times = [t / number for t in timer.repeat(repeat, number)]
+    return min(times), sum(times) / len(times), number
+
+
+def result_key(result):
+    return result["name"], result["pixel_count"], tuple(sorted(result["params"].items()))
+
+
+def run_micro(arguments):
+    """
+    Run the registered micro benchmarks for each pixel count, write the JSON report and optionally compare it
+    against a baseline report.
+
+    :param arguments: argparse Namespace
+    :return: `int` exit status, 1 if a regression was found
+    """
+
+    pixel_counts = arguments.pixels if arguments.pixels else PIXEL_COUNTS
+
+    # Read the baseline first, --output may name the same file
+    baseline = read_report(arguments.compare) if arguments.compare else None
+
+    report = new_report("micro")
+    report["min_time"] = arguments.min_time
+    report["repeat"] = arguments.repeat
+
+    # The debug log of the emulator would be timed along with the benchmarks, and fill the console
+    logging.disable(logging.INFO)
+    for pixel_count in pixel_counts:
+        side = int(math.ceil(math.sqrt(pixel_count)))
+        grid_size = (side, int(math.ceil(pixel_count / float(side))))
+        configure_grid(grid_size)
+        app = EmulatorApp(headless=True, render=True, read_config=False)
+        pixel_count = globals.strip_data.pixel_count
+
+        for name, func in BENCHMARKS:
+            if arguments.filter and arguments.filter not in name:
+                continue
+
+            pattern = config.get("PATTERN"), config.get("ZERO_LOCATION")
+            for params, case in func(app):
+                best, mean, number = time_callable(case, arguments.min_time, arguments.repeat)
+                report["results"].append({
+                    "name": name,
+                    "params": params,
+                    "pixel_count": pixel_count,
+                    "best_us": best * 1e6,
+                    "mean_us": mean * 1e6,
+                    "number": number,
+                })
+                param_text = ", ".join("{}={}".format(k, v) for k, v in sorted(params.items()))
+                print("{:<26} {:<24} {:>8} pixels {:>14.1f} us".format(name, param_text, pixel_count, best * 1e6))
+            config.set("PATTERN", pattern[0])
+            config.set("ZERO_LOCATION", pattern[1])
+    logging.disable(logging.NOTSET)
+
+    write_report(report, arguments.output)
+    print("Report written to '{}'".format(arguments.output))
+
+    if arguments.compare:
+        regressions = compare_reports(baseline, report, METRICS, result_key, arguments.tolerance)
+        for key, metric, old, new in regressions:
+            print("REGRESSION {} {} pixels {}: {:.1f} -> {:.1f} us".format(key[0], key[1], dict(key[2]), old, new))
+        if regressions:
+            return 1
+        print("No regressions against '{}'".format(arguments.compare))
+
+    return 0
@@ -0,0 +1,106 @@
+"""
+Reading, writing and comparing benchmark JSON reports.
+"""
+from __future__ import print_function
+
+import json
+import datetime
+import multiprocessing
+import platform
+
+__all__ = ["new_report", "write_report", "read_report", "compare_reports", ]
+
+
+def new_report(kind):
+    """
+    Create an empty report describing the machine the benchmark was run on.
+
+    :param kind: `str` type of benchmark, "end_to_end" or "micro"
+    :return: `dict` report with an empty results list
+    """
+
+    return {
+        "kind": kind,
+        "created": datetime.datetime.now().isoformat(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "cpu_count": multiprocessing.cpu_count(),
+        "results": [],
+    }
+
+
+def write_report(report, filename):
+    """
+    Write the report to filename as JSON.
+
+    :param report: `dict` report
+    :param filename: `str` path of the file to write
+    :return: None
+    """
+
+    with open(filename, "w") as f:
+        json.dump(report, f, indent=2, sort_keys=True)
+
+
+def read_report(filename):
+    """
+    Read a report written by write_report.
+
+    :param filename: `str` path of the file to read
+    :return: `dict` report
+    """
+
+    with open(filename, "r") as f:
+        return json.load(f)
+
+
+def _lookup(result, metric):
+    """
+    Find a possibly nested metric in a result, "render_ms.p99" is result["render_ms"]["p99"].
+
+    :param result: `dict` single benchmark result
+    :param metric: `str` dotted metric name
+    :return: the metric value, or None if it was not recorded
+    """
+
+    value = result
+    for key in metric.split("."):
+        if not isinstance(value, dict) or key not in value:
+            return None
+        value = value[key]
+    return value
+
+
+def compare_reports(baseline, current, metrics, key, tolerance):
+    """
+    Compare the results of two reports and return the metrics that got worse by more than tolerance.
+
+    :param baseline: `dict` stored baseline report
+    :param current: `dict` report that was just run
+    :param metrics: `dict` of dotted metric name to True if higher is better, False if lower is better
+    :param key: function returning a hashable key that identifies the same benchmark in both reports
+    :param tolerance: `float` allowed relative change, 0.1 is 10%
+    :return: `list` of (key, metric, baseline value, current value) tuples
+    """
+
+    baseline_results = dict((key(result), result) for result in baseline["results"])
+
+    regressions = []
+    for result in current["results"]:
+        old = baseline_results.get(key(result))
+        if old is None:
+            continue
+
+        for metric, higher_is_better in sorted(metrics.items()):
+            old_value = _lookup(old, metric)
+            new_value = _lookup(result, metric)
+            if not old_value or new_value is None:
+                continue
+
+            change = (new_value - old_value) / float(old_value)
+            if higher_is_better:
+                change = -change
+            if change > tolerance:
+                regressions.append((key(result), metric, old_value, new_value))
+
+    return regressions
@@ -0,0 +1,131 @@
+"""
+Lookup tables from the bytes of each received pixel to the color it is displayed with.  The tables are built once
+and applied to a whole frame of pixels with vectorized numpy passes.
+"""
+import numpy
+
+__all__ = ["BRIGHTNESS_LEVELS", "BRIGHTNESS_MASK", "BRIGHTNESS_LUT", "brightness_lut", "brightness_scale",
+           "apply_brightness", "color_order_channels", "channel_selector", "gamma_lut", "heat_lut", "HEAT_LUT", ]
+
+# APA102 global brightness is the low 5 bits of each pixel's control byte
+BRIGHTNESS_LEVELS = 32
+BRIGHTNESS_MASK = BRIGHTNESS_LEVELS - 1
+
+
+def brightness_lut():
+    """
+    APA102 LEDs scale each color value by the global brightness of the pixel, 31 is full brightness.
+
+    :return: numpy uint8 array indexed [brightness][value], the value displayed
+    """
+
+    levels = numpy.arange(BRIGHTNESS_LEVELS, dtype=numpy.uint16)[:, None]
+    values = numpy.arange(256, dtype=numpy.uint16)[None, :]
+    return ((levels * values + BRIGHTNESS_MASK // 2) // BRIGHTNESS_MASK).astype(numpy.uint8)
+
+
+BRIGHTNESS_LUT = brightness_lut()
+
+
+def brightness_scale():
+    """
+    Fraction of full brightness of each global brightness level, for colors that are scaled as floats instead of
+    through BRIGHTNESS_LUT.
+
+    :return: numpy float32 array indexed [brightness]
+    """
+
+    return (numpy.arange(BRIGHTNESS_LEVELS) / float(BRIGHTNESS_MASK)).astype(numpy.float32)
+
+
+def apply_brightness(channels):
+    """
+    Scale the colors of a block of pixels by their global brightness, in place, to the values of BRIGHTNESS_LUT.
+    Pixels at full brightness are left as they are, when every pixel is at full brightness the cost is one pass
+    over the control bytes.  Mixed levels are scaled with a few passes of 16 bit arithmetic, a take from the table
+    needs an index array 8 times the size of the colors.
+
+    :param channels: numpy uint8 array of (c, b, g, r), indexed [...][channel]
+    :return: None
+    """
+
+    levels = channels[..., 0] & BRIGHTNESS_MASK
+    if not levels.size or levels.min() == BRIGHTNESS_MASK:
+        return
+
+    # Each byte times its level, rounded to the nearest value.  The control bytes are scaled too, then put back
+    control = channels[..., 0].copy()
+    scaled = channels.astype(numpy.uint16)
+    scaled *= levels[..., None]
+    scaled += BRIGHTNESS_MASK // 2
+    scaled //= BRIGHTNESS_MASK
+    channels[...] = scaled
+    channels[..., 0] = control
+
+
+def color_order_channels(color_order):
+    """
+    Compile the order the color bytes of each pixel are sent in to the byte index of each color.
+
+    :param color_order: `str` COLOR_ORDER configuration, the order of the 3 color bytes after the control byte,
+                        like "BGR" or "GRB"
+    :return: `tuple` index of the red, green and blue byte inside the 4 bytes of a pixel
+    """
+
+    order = str(color_order).upper()
+    if sorted(order) != ["B", "G", "R"]:
+        raise AttributeError("invalid COLOR_ORDER configuration '{}'".format(color_order))
+    return tuple(1 + order.index(color) for color in "RGB")
+
+
+def channel_selector(rgb_channels):
+    """
+    Compile the byte index of each color to what selects them from an array of pixels.  A slice when the bytes are
+    in order, forwards or backwards, so numpy selects them as a view without a copy.
+
+    :param rgb_channels: `tuple` index of the red, green and blue byte, from color_order_channels
+    :return: `slice` or `list` to index the last axis of an array of pixels
+    """
+
+    r, g, b = rgb_channels
+    step = g - r
+    if step in (1, -1) and b - g == step:
+        stop = b + step
+        return slice(r, stop if stop >= 0 else None, step)
+    return list(rgb_channels)
+
+
+def gamma_lut(gamma):
+    """
+    Table of the value displayed for each received color value.  LEDs give off light in proportion to the value,
+    a screen with a gamma of 2.2 shows the same light as value 255 * (value / 255) ** (1 / 2.2).
+
+    :param gamma: `float` GAMMA configuration, 1.0 shows the values as they are
+    :return: numpy uint8 array of 256 values, or None for a gamma of 1.0
+    """
+
+    if gamma <= 0:
+        raise AttributeError("invalid GAMMA configuration '{}'".format(gamma))
+    if gamma == 1.0:
+        return None
+
+    values = numpy.arange(256) / 255.0
+    return numpy.round(values ** (1.0 / gamma) * 255.0).astype(numpy.uint8)
+
+
+def heat_lut():
+    """
+    Heatmap colors of an activity level, black through blue, red and yellow to white.  Any activity at all starts
+    at a dark blue, so an LED that changed once stands out from one that never changed.
+
+    :return: numpy uint8 array of (r, g, b), indexed [level]
+    """
+
+    stops = (0, 1, 64, 128, 192, 255)
+    colors = ((0, 0, 0), (0, 0, 96), (0, 0, 255), (255, 0, 0), (255, 255, 0), (255, 255, 255))
+    levels = numpy.arange(256)
+    return numpy.stack([numpy.round(numpy.interp(levels, stops, channel)) for channel in zip(*colors)],
+                       axis=1).astype(numpy.uint8)
+
+
+HEAT_LUT = heat_lut()
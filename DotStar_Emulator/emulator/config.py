@@ -14,6 +14,10 @@ _DEFAULT = {
     "WINDOW_SIZE": (640, 480),
     # "WINDOW_SIZE": (800, 600),
     # "FULL_SCREEN": False,
+    "DISPLAY_FPS": 60,  # highest rate the display is drawn at, every received frame is still recorded
+    "EVENT_LOOP": True,  # wait for pygame events, only draw when data or the gui changed. Needs pygame 2
+    "EVENT_LOOP_TIMEOUT": 100,  # ms, longest wait for an event, timers and animations update at least this often
+    "QUALITY_GOVERNOR": True,  # step the render quality down when drawing takes longer than the frame budget
 
     ######################################################################################
     #
@@ -28,6 +32,12 @@ _DEFAULT = {
     "BORDER_SIZE": (1, 1),  # px
     "PERIMETER_BORDER_SIZE": (3, 3),  # px, draw a perimeter border around the grid of pixels px
     "SQUARE_LED": True,  # square up the led when calculating its size. otherwise LED shape will fill the screen space
+    "HOVER_INSPECTOR": True,  # show the position, index and color of the LED under the mouse cursor
+    "DOT_GRID_AGGREGATE": "mean",  # "mean" or "max", color of a block of LEDs when zoomed out past 1px per LED
+    "GLOBAL_BRIGHTNESS": True,  # scale each LED by the APA102 5 bit global brightness of its control byte
+    "COLOR_ORDER": "BGR",  # order of the color bytes after the control byte of each pixel, APA102 is "BGR"
+    "GAMMA": 1.0,  # gamma of the screen, 2.2 shows the light of the LEDs, 1.0 shows the values as they are
+    "EXPOSURE_TIME": 0.05,  # seconds, the E key exposure mode fades the light of each frame to 1/e over this time
 
     "PIXEL_MAPPING": None,
 
@@ -64,6 +74,48 @@ _DEFAULT = {
     #
     "HOST": '127.0.0.1',
     "PORT": 6555,
+    "FRAME_VALIDATION": True,  # check the start frame, control bytes and length of each frame, and count bad frames
+
+    ######################################################################################
+    #
+    # Frame analytics, estimated power draw, brightness histogram and LED activity of the received frames
+    #
+    "FRAME_ANALYTICS": True,  # analyze the received frames on a background thread
+    "POWER_CHANNEL_MA": (20.0, 20.0, 20.0),  # mA of the red, green and blue of an LED at 255 and full brightness
+    "POWER_IDLE_MA": 1.0,  # mA of an LED with every color off
+    "POWER_BUDGET_MA": None,  # mA the power supply can give, frames estimated over it are counted. None to disable
+    "ACTIVITY_TRACKING": True,  # count the changes of each LED, shown by the H key heatmap
+    "ACTIVITY_WINDOW": 120,  # number of received frames the changes of each LED are counted over
+
+    ######################################################################################
+    #
+    # Frame History, the last received frames can be paused on and stepped through
+    #
+    "HISTORY_FRAMES": 600,  # number of frames kept
+    "HISTORY_MAX_MB": 64,  # memory limit of the history, fewer frames are kept for large grids
+
+    ######################################################################################
+    #
+    # Headless Settings, manage.py run --headless
+    #
+    "HEADLESS_STATS_INTERVAL": 5,  # seconds between logged throughput statistics
+
+    ######################################################################################
+    #
+    # Performance Information
+    #
+    "TIMING_SAMPLES": 240,  # number of main loop and packet timings kept for the averages and p99
+    "RATE_SAMPLES": 4096,  # number of packet arrival times kept for the packet rate and jitter
+    "RATE_WINDOW": 1.0,  # seconds, packet rate and jitter are calculated over this window
+    "RATE_GAP_FACTOR": 4.0,  # a packet interval this many times the median is counted as a gap
+    "RATE_STALL_SECONDS": 1.0,  # seconds without a packet before the stream is shown as stalled
+
+    ######################################################################################
+    #
+    # Metrics endpoint, Prometheus text format served at http://METRICS_HOST:METRICS_PORT/metrics
+    #
+    "METRICS_HOST": '127.0.0.1',
+    "METRICS_PORT": None,  # None to disable
 
     ######################################################################################
     #
@@ -105,6 +157,21 @@ _READ_ONLY = {
     "WINDOW_CAPTION": "DotStar Emulator",
     "EMU_RUNNING_MIN_RIGHT_COL_WIDTH": -300,
     "FPS_UPDATE_RATE": 50,
+    "PERFORMANCE_UPDATE_RATE": 500,
+    "PACKET_RATE_UPDATE_RATE": 250,
+    "SPARKLINE_UPDATE_RATE": 50,
+    "MAX_DIRTY_RECTS": 32,  # more changed areas than this and the whole screen is drawn
+    "DOT_GRID_FULL_REPAINT": 0.25,  # fraction of changed pixels above which the whole grid is rendered again
+    "DOT_GRID_ZOOM_STEP": 2.0,  # zoom factor of each mouse wheel step
+    "DOT_GRID_MIN_VISIBLE": 4,  # LEDs still visible across the grid at the highest zoom
+    "HISTORY_SCRUB_STEP": 10,
+    "POWER_SAMPLES": 240,  # number of analyzed frames the average power draw is taken over
+    "BRIGHTNESS_BINS": 16,  # bins of the LED brightness histogram
+    "ACTIVITY_MAX_MB": 16,  # memory limit of the changed LEDs kept for ACTIVITY_WINDOW, fewer frames for large grids
+    "QUALITY_WINDOW": 30,  # frames averaged for each render quality decision
+    "QUALITY_DOWN_FRACTION": 0.8,  # fraction of the frame budget above which the quality steps down
+    "QUALITY_UP_FRACTION": 0.4,  # fraction of the frame budget below which the quality steps up
+    "QUALITY_UP_WINDOWS": 4,  # windows in a row below QUALITY_UP_FRACTION before the quality steps up
 
     "DOT_GRID_SELECT_SPEED": 150,
     "DOT_GRID_SELECT_COLORS": (
@@ -1,5 +1,7 @@
 from __future__ import print_function
 
+import numpy
+
 from DotStar_Emulator.emulator import config
 from DotStar_Emulator.emulator.vector2 import Vector2
 
@@ -27,6 +29,23 @@ class MappingData(object):
             self.prebuilt_mappings()
             self.pixel_count = int(self.grid_size.x * self.grid_size.y)
 
+        # Reverse mapping, the (x, y) grid position of each pixel index
+        self.positions = [None] * self.pixel_count
+        for x, column in enumerate(self.data):
+            for y, index in enumerate(column):
+                if index is not None:
+                    self.positions[index] = (x, y)
+
+        # The same as arrays of columns and rows, for vectorized drawing
+        positions = numpy.array(self.positions, dtype=numpy.intp).reshape(-1, 2)
+        self.pixel_x = positions[:, 0]
+        self.pixel_y = positions[:, 1]
+
+        # The pixel index of each grid cell as an array indexed [x][y], -1 where a cell is not mapped
+        self.cell_index = numpy.full((int(self.grid_size.x), int(self.grid_size.y)), -1, dtype=numpy.intp)
+        self.cell_index[self.pixel_x, self.pixel_y] = numpy.arange(self.pixel_count)
+        self.unmapped = self.pixel_count < self.cell_index.size
+
     def custom_mapping(self, pixel_mapping):
 
         columns, rows = self.confirm_customer_size(pixel_mapping)
@@ -124,6 +143,15 @@ class MappingData(object):
         """
         return self.data[x][y]
 
+    def position(self, index):
+        """
+        Return the grid x, y coordinate of a pixel_index
+
+        :param index: pixel index
+        :return: (x, y)
+        """
+        return self.positions[index]
+
     def horizontal(self, cardinal=False, left_to_right=True):
         """
         Map pixel_index to the x, y grid
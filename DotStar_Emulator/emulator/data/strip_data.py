@@ -1,11 +1,18 @@
 import logging
 import datetime
+from array import array
 
 import blinker
+import numpy
 
 from DotStar_Emulator.emulator.vector2 import Vector2
 from DotStar_Emulator.emulator import config
 from DotStar_Emulator.emulator import globals
+from DotStar_Emulator.emulator.stats import Histogram, perf_counter
+from DotStar_Emulator.emulator.rate_estimator import RateEstimator
+from DotStar_Emulator.emulator.color_lut import color_order_channels
+from DotStar_Emulator.emulator.activity import ActivityTracker
+from DotStar_Emulator.emulator.exposure import ExposureBuffer
 
 
 
@@ -14,6 +21,16 @@ data_log = logging.getLogger("data")
 
 __all__ = ["StripData", ]
 
+# Histogram bucket upper bounds, in seconds, of the time between received frames
+INTERARRIVAL_BUCKETS = (0.001, 0.002, 0.005, 0.01, 0.02, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5)
+
+# Name of each byte of a pixel, in the order they are stored
+CHANNELS = ("c", "b", "g", "r")
+
+# Every frame starts with 4 zero bytes, and the control byte of every pixel with the bits 0b111
+START_FRAME = bytearray(4)
+CONTROL_MARKER = 0xE0
+
 
 class StripData(object):
 
@@ -28,6 +45,9 @@ class StripData(object):
         # self.pixel_count = int(self.grid_size.x * self.grid_size.y)
         self.pixel_count = globals.mapping_data.pixel_count
 
+        # Index of the red, green and blue byte of each pixel, from COLOR_ORDER
+        self.rgb_channels = color_order_channels(config.get("COLOR_ORDER"))
+
         # setup initial pixel data
         size = self.pixel_count * 4
         self.data = bytearray(size)
@@ -37,6 +57,38 @@ class StripData(object):
 
         self.updated = None  # datetime of last time start frame was received
         self.packet_length = 0  # count of number of individual bytes received since last start frame was received.
+        self.frame_count = 0  # total number of frames received
+        self.byte_count = 0  # total number of bytes received
+        self.frames_displayed = 0  # number of received frames that were passed on to be displayed
+        self._displayed_frame_count = 0  # frame_count at the last update call
+        self.last_recv = None  # perf_counter time the last frame was received
+        self.interarrival = Histogram(INTERARRIVAL_BUCKETS)  # seconds between received frames
+        # arrival times of received frames, for the packet rate and jitter
+        self.arrivals = RateEstimator(config.get("RATE_SAMPLES"), config.get("RATE_WINDOW"),
+                                      config.get("RATE_GAP_FACTOR"), config.get("RATE_STALL_SECONDS"))
+
+        # Frame validation, FRAME_VALIDATION set in config.  A full frame is the start frame, 4 bytes per pixel, and
+        # an end frame of a clock edge for every 2 pixels.
+        self.validate = config.get("FRAME_VALIDATION")
+        self.end_frame_length = (self.pixel_count + 15) // 16
+        self.frame_length = 4 + size + self.end_frame_length
+        self.malformed_frames = 0  # frames without a zero start frame, or with a control byte missing its marker
+        self.wrong_length_frames = 0  # frames with fewer pixels than the strip, or longer than a full frame
+        self.short_end_frames = 0  # frames with every pixel, but an end frame too short to latch the last pixels
+        self._no_pixels = numpy.empty(0, dtype=numpy.uint32)
+
+        self.analytics = None  # FrameAnalytics each received frame is handed to, set by the app
+
+        # Changes of each LED over the last ACTIVITY_WINDOW received frames, bounded by ACTIVITY_MAX_MB
+        self.activity = None
+        if config.get("ACTIVITY_TRACKING"):
+            max_frames = int(config.get("ACTIVITY_MAX_MB") * 1024 * 1024) // self.pixel_count \
+                if self.pixel_count else 0
+            self.activity = ActivityTracker(self.pixel_count, min(config.get("ACTIVITY_WINDOW"), max_frames))
+
+        # Light of every received frame accumulated over EXPOSURE_TIME, while the exposure mode is enabled
+        self.exposure = ExposureBuffer(self.pixel_count, self.rgb_channels, config.get("EXPOSURE_TIME"),
+                                       config.get("GLOBAL_BRIGHTNESS"))
 
         self._dirty = True  # keep track if data has been changed since last update call
 
@@ -48,32 +100,113 @@ class StripData(object):
         self.buffer_count = 0
         self.buffer = bytearray((0xFF, 0xFF, 0xFF, 0xFF))
 
+        # Frame history, the last history_size received frames in one preallocated buffer, bounded by
+        # HISTORY_FRAMES and HISTORY_MAX_MB.
+        max_frames = int(config.get("HISTORY_MAX_MB") * 1024 * 1024) // size if size else 0
+        self.history_size = max(0, min(config.get("HISTORY_FRAMES"), max_frames))
+        self.history = bytearray(self.history_size * size)
+        self.history_times = array("d", [0.0]) * self.history_size  # perf_counter time each frame was received
+        self.history_count = 0  # total number of frames captured
+
+        # The display shows data, or a frame copied out of the history while paused
+        self.display = self.data
+        self.paused = False
+        self.history_frame = None  # history_count of the displayed frame while paused
+        self._paused_data = bytearray(size)
+
+        # Copy of the displayed pixels at the last changed_pixels call, one uint32 per pixel, and the buffer the
+        # next copy is taken into
+        self._compared = self.pixel_words().copy()
+        self._compare_next = numpy.empty_like(self._compared)
+
+        app_log.info("Frame history of %s frames, %.1f MB", self.history_size, len(self.history) / 1024.0 / 1024.0)
+
+    def validate_frame(self, msg):
+        """
+        Check the framing of a received message, and count what is wrong with it.  The control bytes are checked
+        with a single bitwise and over every pixel, its first byte holds the bits set in every control byte.  The
+        frame is still displayed, cut short or with the pixels it is missing left as they were.
+
+        :param msg: bytearray
+        :return: `bool` True if the frame is valid
+        """
+
+        msg_length = len(msg)
+        valid = True
+
+        if msg_length > self.frame_length or msg_length < self.frame_length - self.end_frame_length:
+            self.wrong_length_frames += 1
+            valid = False
+        elif msg_length < self.frame_length:
+            self.short_end_frames += 1
+            valid = False
+
+        # And of no pixels is all bits set
+        pixels = min(max(msg_length - 4, 0), len(self.data)) // 4
+        words = numpy.frombuffer(msg, dtype=numpy.uint32, count=pixels, offset=4) if pixels else self._no_pixels
+        control = numpy.bitwise_and.reduce(words, keepdims=True).view(numpy.uint8)[0]
+        if msg[0:4] != START_FRAME or control & CONTROL_MARKER != CONTROL_MARKER:
+            self.malformed_frames += 1
+            valid = False
+
+        if not valid:
+            data_log.debug("Invalid frame of %s bytes, expected %s", msg_length, self.frame_length)
+        return valid
+
     def spi_recv(self, msg):
         """
-        Currently no checking of msg integrity or first four bytes being 0x00 is done. Msg is assumed
-        to be correct. Future versions may provide a config that can be set that will perform
-        some checks on the message, and search for the first data byte.
+        Copy a received frame into the pixel data.  The first 4 bytes are taken to be the start frame, and the
+        pixels are copied from there, up to the length of the strip.  When FRAME_VALIDATION is set the framing is
+        checked and counted first.  A message shorter than the start frame is dropped.
 
         :param msg: bytearray
         :return: None
         """
 
+        if self.validate:
+            self.validate_frame(msg)
+
         msg_length = len(msg)
         data_length = len(self.data)
+        if msg_length < len(START_FRAME):
+            data_log.debug("Dropped message of %s bytes, shorter than the start frame", msg_length)
+            return
 
-        # Check if message is longer than pixel count
-        if (msg_length - 4) / 4 >= data_length:
-            end = data_length
-        else:
-            end = (msg_length - 4)
+        # Check if message is longer than pixel count, the end frame is not copied
+        end = min(max(msg_length - 4, 0), data_length)
 
         # Splice in the data from the message
         self.data[0:end] = msg[4:end+4]
+        if self.activity is not None:
+            self.activity.observe(numpy.frombuffer(self.data, dtype=numpy.uint32), end // 4)
+        if self.analytics is not None:
+            self.analytics.submit(msg)
+
+        now = perf_counter()
+
+        if self.exposure.enabled:
+            self.exposure.observe(numpy.frombuffer(self.data, dtype=numpy.uint8).reshape(-1, 4), now)
+
+        # Capture the frame into the history, a single copy into the preallocated buffer
+        if self.history_size:
+            slot = self.history_count % self.history_size
+            self.history[slot * data_length:(slot + 1) * data_length] = self.data
+            self.history_times[slot] = now
+            self.history_count += 1
+
+        if self.last_recv is not None:
+            self.interarrival.observe(now - self.last_recv)
+        self.last_recv = now
+        self.arrivals.record(now)
 
         self._signal_startrecv.send(self)
         self.updated = datetime.datetime.now()
         self.packet_length = msg_length
-        self._dirty = True
+        self.frame_count += 1
+        self.byte_count += msg_length
+        # While paused the received frame is recorded, but the display does not change
+        if not self.paused:
+            self._dirty = True
 
     def update(self, elapsed):
         """
@@ -89,17 +222,165 @@ class StripData(object):
             self._signal_updated.send(self)
             self._dirty = False
 
+            # Only the latest of the frames received since the last update is displayed
+            if self.frame_count != self._displayed_frame_count:
+                self._displayed_frame_count = self.frame_count
+                self.frames_displayed += 1
+
+    @property
+    def frames_not_displayed(self):
+        """
+        :return: `int` number of received frames that were replaced by a newer frame, or recorded while paused,
+                 before they could be displayed
+        """
+
+        return self.frame_count - self.frames_displayed
+
+    def changed_pixels(self):
+        """
+        Find the displayed pixels that changed since the last call, with one vectorized compare of the 4 byte
+        pixels.  The display is copied before the compare, so a frame received during the call is found by the
+        next call.
+
+        :return: numpy array of the changed pixel indexes
+        """
+
+        numpy.copyto(self._compare_next, self.pixel_words())
+        changed = numpy.flatnonzero(self._compare_next != self._compared)
+        self._compared, self._compare_next = self._compare_next, self._compared
+        return changed
+
+    def oldest_history_frame(self):
+        """
+        :return: `int` history_count of the oldest frame still held in the history.  The very oldest frame is
+                 skipped, as the data reader may be overwriting it.
+        """
+
+        return max(0, self.history_count - self.history_size + 1)
+
+    def show_history_frame(self, frame):
+        """
+        Pause the display on a frame of the history.  The frame is copied out of the history, so it stays on the
+        display when the history wraps around.
+
+        :param frame: `int` history_count of the frame, clamped to the frames held in the history
+        :return: None
+        """
+
+        if not self.history_count:
+            return
+
+        frame = max(self.oldest_history_frame(), min(frame, self.history_count - 1))
+        size = len(self.data)
+        slot = frame % self.history_size
+        self._paused_data[:] = self.history[slot * size:(slot + 1) * size]
+
+        self.history_frame = frame
+        self.display = self._paused_data
+        self.paused = True
+        self._dirty = True
+
+    def pause(self):
+        """
+        Pause the display on the newest received frame.  Frames are still received and recorded to the history.
+
+        :return: None
+        """
+
+        self.show_history_frame(self.history_count - 1)
+
+    def resume(self):
+        """
+        Return the display to the live data.
+
+        :return: None
+        """
+
+        self.paused = False
+        self.history_frame = None
+        self.display = self.data
+        self._dirty = True
+
+    def step_history(self, frames):
+        """
+        Move the paused display through the history, pausing on the newest frame first if live.
+
+        :param frames: `int` number of frames to move, negative is back in time
+        :return: None
+        """
+
+        if not self.paused:
+            self.pause()
+        if self.paused:
+            self.show_history_frame(self.history_frame + frames)
+
+    def history_offset(self):
+        """
+        :return: (`int` frames, `float` seconds) the paused frame is behind the newest received frame, or None
+                 if not paused
+        """
+
+        if not self.paused:
+            return None
+
+        newest = self.history_count - 1
+        seconds = self.history_times[newest % self.history_size] - \
+            self.history_times[self.history_frame % self.history_size]
+        return self.history_frame - newest, seconds
+
     def clear_data(self):
         """
         Clear the pixel data data
 
         :return: None
         """
-        for i in range(self.pixel_count):
-            r = 0x00
-            g = 0x00
-            b = 0x00
-            self.set(i, 0xFF, b, g, r)
+        self.fill(0xFF, 0x00, 0x00, 0x00)
+
+    def fill(self, c, b, g, r, start=0, stop=None):
+        """
+        Set a range of pixels to the same pixel data, with a single slice assignment of the 4 byte pixels.
+
+        :param c: `byte` Control byte value
+        :param b: `byte` Blue color value
+        :param g: `byte` Green color value
+        :param r: `byte` Red color Value
+        :param start: `int`, default=0, first pixel index
+        :param stop: `int`, default=None, pixel index after the last, None fills to the end of the strip
+        :return: None
+        """
+        pixel = numpy.frombuffer(bytearray((c, b, g, r)), dtype=numpy.uint32)[0]
+        numpy.frombuffer(self.data, dtype=numpy.uint32)[start:stop] = pixel
+        self._dirty = True
+
+    def pixel_words(self):
+        """
+        :return: numpy uint32 array of the displayed pixels, one per pixel.  A view of the data without a copy.
+        """
+        return numpy.frombuffer(self.display, dtype=numpy.uint32)
+
+    def pixel_bytes(self):
+        """
+        :return: numpy uint8 array of the displayed pixels, indexed [pixel][channel] c, b, g, r.  A view of the
+                 data without a copy.
+        """
+        return numpy.frombuffer(self.display, dtype=numpy.uint8).reshape(-1, 4)
+
+    def channel(self, name):
+        """
+        :param name: `str` "c", "b", "g" or "r"
+        :return: numpy uint8 array of one channel of every displayed pixel.  A strided view of the data without a
+                 copy.
+        """
+        return self.pixel_bytes()[:, CHANNELS.index(name)]
+
+    def get_many(self, indexes):
+        """
+        Return the displayed pixel data of many pixels at once, in one copy instead of a tuple per pixel.
+
+        :param indexes: numpy array or `list` of pixel indexes
+        :return: numpy uint8 array indexed [i][channel] c, b, g, r, in the order of indexes
+        """
+        return self.pixel_bytes().take(indexes, axis=0)
 
     def set(self, index, c, b, g, r):
         """
@@ -124,14 +405,27 @@ class StripData(object):
 
     def get(self, index):
         """
-        Return the stored pixel data for the given index
+        Return the displayed pixel data for the given index, which is a frame from the history while paused.
 
         :param index: `integer` of the pixel index
         :return: (c, b, g, r)
         """
         i = index * 4
-        c = self.data[i]
-        b = self.data[i+1]
-        g = self.data[i+2]
-        r = self.data[i+3]
+        data = self.display
+        c = data[i]
+        b = data[i+1]
+        g = data[i+2]
+        r = data[i+3]
         return c, b, g, r
+
+    def get_rgb(self, index):
+        """
+        Return the displayed color of the given index, read in COLOR_ORDER.
+
+        :param index: `integer` of the pixel index
+        :return: (r, g, b)
+        """
+        i = index * 4
+        data = self.display
+        r, g, b = self.rgb_channels
+        return data[i+r], data[i+g], data[i+b]
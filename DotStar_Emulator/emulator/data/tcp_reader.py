@@ -4,11 +4,17 @@ import logging
 from multiprocessing.connection import Listener
 import select
 
+import pygame
+
 from DotStar_Emulator.emulator import config, globals
+from DotStar_Emulator.emulator.stats import RingBuffer, perf_counter
 
 log = logging.getLogger("data")
 
-__all__ = ["TCPReader", ]
+__all__ = ["TCPReader", "DATA_EVENT", ]
+
+# pygame event posted when a received frame has been published to strip_data, wakes the event driven main loop
+DATA_EVENT = pygame.USEREVENT + 1
 
 
 class TCPReader(threading.Thread):
@@ -36,6 +42,37 @@ class TCPReader(threading.Thread):
         self.startup = threading.Event()
         self.startup_success = False
 
+        # Number of clients currently connected, only one is served at a time
+        self.connected_clients = 0
+
+        # Seconds taken to receive and unpickle each message, and to copy it into strip_data
+        samples = config.get("TIMING_SAMPLES")
+        self.timings = {
+            "recv": RingBuffer(samples),
+            "copy": RingBuffer(samples),
+        }
+
+        # Post a DATA_EVENT for each published frame, set by the app when running the event driven main loop.
+        # Only one event is queued at a time, the main loop clears event_pending when it handles the event.
+        self.post_events = False
+        self.event_pending = False
+
+    def post_data_event(self):
+        """
+        Post a DATA_EVENT to the pygame event queue, unless one is already waiting to be handled.
+
+        :return: None
+        """
+
+        if self.event_pending:
+            return
+        self.event_pending = True
+        try:
+            pygame.event.post(pygame.event.Event(DATA_EVENT))
+        except pygame.error:
+            # Queue is full, the main loop will still pick up the frame on its next wake up
+            self.event_pending = False
+
     def open_listener(self):
         """
         Open Listener to the specified socket.  Set an event and report to the main thread if it was successful
@@ -75,16 +112,28 @@ class TCPReader(threading.Thread):
                     connection = None
                     try:
                         connection = self.listener.accept()
+                        self.connected_clients = 1
                         log.info("Connection opened by %s", self.listener.last_accepted)
 
+                        recv_timings = self.timings["recv"]
+                        copy_timings = self.timings["copy"]
                         while self.running:
-                            if connection.poll():
+                            # Wait for the next message, but not forever so the thread can be stopped
+                            if connection.poll(0.01):
+                                start = perf_counter()
                                 msg = connection.recv()
+                                received = perf_counter()
                                 globals.strip_data.spi_recv(msg)
+                                recv_timings.append(received - start)
+                                copy_timings.append(perf_counter() - received)
+                                if self.post_events:
+                                    self.post_data_event()
                     except (IOError, EOFError):
                         if connection:
                             connection.close()
                         log.info("Connection closed %s", self.listener.last_accepted)
+                    finally:
+                        self.connected_clients = 0
 
         log.info("Exiting thread")
 
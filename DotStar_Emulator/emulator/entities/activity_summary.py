@@ -0,0 +1,76 @@
+from __future__ import print_function
+
+from DotStar_Emulator.emulator import globals
+from DotStar_Emulator.emulator.entity import Entity
+from DotStar_Emulator.emulator import config
+
+
+class ActivitySummary(Entity):
+    def __init__(self, dotgrid):
+        """
+        Entity to draw a banner over the bottom left of the dotgrid while it shows the activity heatmap, with the
+        pixel bytes of each received frame that repeat the previous frame.  Those are the bytes a delta protocol, or
+        a controller that only sends changed pixels, would save.
+
+        :param dotgrid: DotGridWidget the banner is drawn over
+        :return:
+        """
+        super(ActivitySummary, self).__init__()
+
+        self.dotgrid = dotgrid
+        self.font = globals.current_app.get_font(13)
+        self.text = None
+        self.text_rect = None  # screen space rect of the banner
+        self.update_rate = config.get("PERFORMANCE_UPDATE_RATE")
+        self.elapsed = self.update_rate + 1
+
+    @staticmethod
+    def summary_text(activity):
+        """
+        :param activity: ActivityTracker of the strip
+        :return: `str` mean redundant bytes of a frame over the window, and their share of the pixel bytes of a
+                 full frame
+        """
+
+        redundant = activity.redundant_bytes.mean()
+        if redundant is None:
+            return "Redundant -"
+
+        share = redundant / (activity.pixel_count * 4.0) * 100.0 if activity.pixel_count else 0.0
+        return "Redundant {:.0f} B/frame, {:.0f}%".format(redundant, share)
+
+    def update(self, elapsed):
+        """
+        Update the banner text at PERFORMANCE_UPDATE_RATE while the heatmap is shown.
+
+        :param elapsed: milliseconds og pygame clock since last call
+        :return: None
+        """
+
+        self.elapsed += elapsed
+        if self.elapsed < self.update_rate and self.dotgrid.heatmap == (self.text is not None):
+            return
+        self.elapsed = 0
+
+        old_rect = self.text_rect
+        if self.dotgrid.heatmap:
+            text = self.summary_text(globals.strip_data.activity)
+            self.text = self.font.render(text, True, (255, 255, 255), (0, 0, 160))
+            self.text_rect = self.text.get_rect()
+            self.text_rect.bottomleft = self.dotgrid.layout.global_rect.move(2, -2).bottomleft
+        elif self.text:
+            self.text = None
+        else:
+            return
+        self.request_redraw(self.text_rect if old_rect is None else self.text_rect.union(old_rect))
+
+    def on_draw_after(self, surface):
+        """
+        Draw the banner ontop of the gui
+
+        :param surface: surface to blit the Widget.surface to.
+        :return: None
+        """
+
+        if self.text:
+            surface.blit(self.text, self.text_rect)
@@ -0,0 +1,133 @@
+from __future__ import print_function
+
+import blinker
+import pygame
+
+from DotStar_Emulator.emulator import globals
+from DotStar_Emulator.emulator.entity import Entity
+from DotStar_Emulator.emulator.vector2 import Vector2
+
+
+class DotGridHover(Entity):
+    def __init__(self, dotgrid):
+        """
+        Entity to inspect the LED under the mouse cursor.  A label with the grid position, strip index and color of
+        the LED is drawn next to its grid cell, and follows the displayed data.  The cell under the cursor is found
+        with a floor division, so this keeps up with every mouse motion event on any size of grid.
+
+        :param dotgrid: DotGridWidget to inspect
+        :return:
+        """
+        super(DotGridHover, self).__init__()
+
+        self.dotgrid = dotgrid
+        self.font = globals.current_app.get_font(13)
+
+        self.cell = None  # (x, y) grid cell under the mouse cursor
+        self.label = None  # text of the label
+        self.text = None  # rendered label
+        self.text_rect = None  # screen space rect of the label
+
+        blinker.signal("event.mousemotion").connect(self.on_mousemotion)
+        blinker.signal("stripdata.updated").connect(self.on_data_updated)
+        blinker.signal("dotgrid.view.changed").connect(self.on_view_changed)
+
+    def on_mousemotion(self, sender, event):
+        """
+        Callback for the app/pygame mousemotion event.  Find the grid cell under the cursor.
+
+        :param sender: blinker sender
+        :param event: pygame Event
+        :return: None
+        """
+
+        self.inspect(event.pos)
+
+    def on_view_changed(self, sender):
+        """
+        Event callback when the dotgrid view was zoomed or panned, a different LED is now under the cursor and the
+        label moved with its cell.
+
+        :param sender: blinker sender
+        :return: None
+        """
+
+        self.inspect(pygame.mouse.get_pos(), moved=True)
+
+    def inspect(self, pos, moved=False):
+        """
+        Inspect the grid cell at a position.
+
+        :param pos: (x, y) screen position
+        :param moved: `bool` the grid cells moved, place the label again even if the cell did not change
+        :return: None
+        """
+
+        global_rect = self.dotgrid.layout.global_rect
+        cell = None
+        if global_rect.collidepoint(pos):
+            cell = self.dotgrid.cell_at(Vector2(pos) - Vector2(global_rect.topleft))
+
+        if cell != self.cell or moved:
+            self.cell = cell
+            self.update_label(moved)
+
+    def on_data_updated(self, sender):
+        """
+        Event callback when the displayed strip_data changed, the color of the inspected LED may have changed.
+
+        :param sender: blinker sender
+        :return: None
+        """
+
+        if self.cell is not None:
+            self.update_label()
+
+    def update_label(self, moved=False):
+        """
+        Render the label of the inspected grid cell, and redraw the area of the old and new label.
+
+        :param moved: `bool` place the label again even if its text did not change
+        :return: None
+        """
+
+        if self.cell is None:
+            label = None
+        else:
+            x, y = self.cell
+            index = globals.mapping_data.get(x, y)
+            if index is None:
+                label = "({}, {}) not mapped".format(x, y)
+            else:
+                r, g, b = globals.strip_data.get_rgb(index)
+                label = "({}, {}) #{} ({}, {}, {})".format(x, y, index, r, g, b)
+
+        if label == self.label and not moved:
+            return
+        self.label = label
+
+        old_rect = self.text_rect
+        if label is None:
+            self.text = None
+            self.text_rect = None
+        else:
+            global_rect = self.dotgrid.layout.global_rect
+            self.text = self.font.render(label, True, (255, 255, 255), (40, 40, 40))
+            self.text_rect = self.text.get_rect()
+            self.text_rect.topleft = self.dotgrid.grid_rect(x, y).move(global_rect.topleft).bottomright
+            self.text_rect.clamp_ip(global_rect)
+
+        for rect in (old_rect, self.text_rect):
+            if rect is not None:
+                self.request_redraw(rect)
+
+    def on_draw_after(self, surface):
+        """
+        Draw the label ontop of the gui
+
+        :param surface: surface to blit the Widget.surface to.
+        :return: None
+        """
+
+        if self.text:
+            surface.blit(self.text, self.text_rect)
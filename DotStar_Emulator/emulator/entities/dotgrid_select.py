@@ -28,10 +28,11 @@ class DotGridSelect(Entity):
 
         blinker.signal("event.mousebuttondown").connect(self.on_mousebuttondown)
         blinker.signal("event.keydown").connect(self.on_keydown)
+        blinker.signal("dotgrid.view.changed").connect(self.on_view_changed)
 
     def set(self, x, y):
         """
-        Set the highlighter to the given grid cell.
+        Set the highlighter to the given grid cell, and pan the dotgrid view to it if needed.
         Trigger Blinker Event "dotgrid.select.set"
         :param x: Integer
         :param y: Integer
@@ -45,6 +46,8 @@ class DotGridSelect(Entity):
 
         self.selected = True
         self.set_event.send(self, x=self.x, y=self.y)
+        self.dotgrid.scroll_to(x, y)
+        self.request_redraw(self.highlight_area())
 
     def clear(self):
         """
@@ -56,6 +59,7 @@ class DotGridSelect(Entity):
         if self.selected:
             self.clear_event.send(self, x=self.x, y=self.y)
             self.selected = False
+            self.request_redraw(self.highlight_area())
             return True
         return False
 
@@ -63,18 +67,16 @@ class DotGridSelect(Entity):
 
         global_rect = self.dotgrid.layout.global_rect
 
-        if global_rect.collidepoint(event.pos):
-            grid_size = self.dotgrid.grid_size
-            grid_rects = self.dotgrid.grid_rects
-            pos = Vector2(event.pos) - Vector2(global_rect.topleft)
-            for x in range(int(grid_size.x)):
-                for y in range(int(grid_size.y)):
-                    if grid_rects[x][y].collidepoint(pos):
-                        if self.selected and self.x == x and self.y == y:
-                            self.clear()
-                        else:
-                            # self.clear()
-                            self.set(x, y)
+        # Only the left button selects, the others zoom and pan the dotgrid
+        if event.button == 1 and global_rect.collidepoint(event.pos):
+            cell = self.dotgrid.cell_at(Vector2(event.pos) - Vector2(global_rect.topleft))
+            if cell is not None:
+                x, y = cell
+                if self.selected and self.x == x and self.y == y:
+                    self.clear()
+                else:
+                    # self.clear()
+                    self.set(x, y)
 
     def on_keydown(self, sender, event):
         """
@@ -109,6 +111,18 @@ class DotGridSelect(Entity):
                 y = self.y
                 self.set(x, y)
 
+    def on_view_changed(self, sender):
+        """
+        Event callback when the dotgrid view was zoomed or panned.  The dotgrid redraws all of itself, so the
+        highlighter is drawn again at its new position.
+
+        :param sender: blinker sender
+        :return: None
+        """
+
+        if self.selected:
+            self.request_redraw(self.highlight_area())
+
     def update(self, elapsed):
         self.elapsed += elapsed
         if self.elapsed >= self.speed:
@@ -116,12 +130,21 @@ class DotGridSelect(Entity):
             self.step += 1
             if self.step >= 4:
                 self.step = 0
+            if self.selected and self.dotgrid.in_view(self.x, self.y):
+                self.request_redraw(self.highlight_area())
+
+    def highlight_area(self):
+        """
+        :return: pygame.Rect in screen space covering the highlighter at every step of its animation
+        """
+
+        rect = self.dotgrid.grid_rect(self.x, self.y).move(self.dotgrid.layout.global_rect.topleft)
+        return rect.inflate(8, 8)
 
     def on_draw_after(self, surface):
         # print('on_draw_after', self.dotgrid)
-        if self.selected:
-            grid_rect = self.dotgrid.grid_rects[self.x][self.y]
-            rect = grid_rect.copy()
+        if self.selected and self.dotgrid.in_view(self.x, self.y):
+            rect = self.dotgrid.grid_rect(self.x, self.y)
             rect.x += self.dotgrid.layout.global_rect.x
             rect.y += self.dotgrid.layout.global_rect.y
 
@@ -0,0 +1,94 @@
+from __future__ import print_function
+
+import blinker
+import pygame
+
+from DotStar_Emulator.emulator import globals
+from DotStar_Emulator.emulator.entity import Entity
+from DotStar_Emulator.emulator import config
+
+
+class FrameHistoryControl(Entity):
+    def __init__(self, dotgrid):
+        """
+        Entity to pause the display and step through strip_data's frame history with the keyboard.  While paused
+        a banner is drawn over the top left of the dotgrid.
+
+        [Space] pause / resume, [,] [.] step one frame, [Page Up] [Page Down] scrub HISTORY_SCRUB_STEP frames,
+        [Home] [End] oldest / newest frame.
+
+        :param dotgrid: DotGridWidget the banner is drawn over
+        :return:
+        """
+        super(FrameHistoryControl, self).__init__()
+
+        self.dotgrid = dotgrid
+        self.font = globals.current_app.get_font(13)
+        self.text = None
+        self.text_rect = None  # screen space rect of the banner
+        self.scrub_step = config.get("HISTORY_SCRUB_STEP")
+
+        blinker.signal("event.keydown").connect(self.on_keydown)
+        blinker.signal("stripdata.updated").connect(self.on_data_updated)
+
+    def on_keydown(self, sender, event):
+        """
+        pygame event KEYDOWN event call back.
+
+        :param sender:
+        :param event: pygame Event
+        :return: None
+        """
+
+        strip_data = globals.strip_data
+
+        if event.key == pygame.K_SPACE:
+            if strip_data.paused:
+                strip_data.resume()
+            else:
+                strip_data.pause()
+        elif event.key == pygame.K_COMMA:
+            strip_data.step_history(-1)
+        elif event.key == pygame.K_PERIOD:
+            strip_data.step_history(1)
+        elif event.key == pygame.K_PAGEUP:
+            strip_data.step_history(-self.scrub_step)
+        elif event.key == pygame.K_PAGEDOWN:
+            strip_data.step_history(self.scrub_step)
+        elif event.key == pygame.K_HOME:
+            strip_data.step_history(-strip_data.history_size)
+        elif event.key == pygame.K_END:
+            strip_data.step_history(strip_data.history_size)
+
+    def on_data_updated(self, sender):
+        """
+        Event callback when the displayed strip_data changed, render the banner text.
+
+        :param sender: blinker sender
+        :return: None
+        """
+
+        offset = globals.strip_data.history_offset()
+        if offset is None:
+            if self.text:
+                self.text = None
+                self.request_redraw(self.text_rect)
+        else:
+            frames, seconds = offset
+            text = "PAUSED {} frames, {:.3f} s".format(frames, -seconds)
+            old_rect = self.text_rect
+            self.text = self.font.render(text, True, (255, 255, 255), (200, 0, 0))
+            self.text_rect = self.text.get_rect()
+            self.text_rect.topleft = self.dotgrid.layout.global_rect.move(2, 2).topleft
+            self.request_redraw(self.text_rect if old_rect is None else self.text_rect.union(old_rect))
+
+    def on_draw_after(self, surface):
+        """
+        Draw the paused banner ontop of the gui
+
+        :param surface: surface to blit the Widget.surface to.
+        :return: None
+        """
+
+        if self.text:
+            surface.blit(self.text, self.text_rect)
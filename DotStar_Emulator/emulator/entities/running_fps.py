@@ -19,6 +19,7 @@ class RunningFPS(Entity):
 
         self.font = globals.current_app.get_font(13)
         self.text = None
+        self.fps = None
         self.text_pos = None
         self.update_rate = config.get("FPS_UPDATE_RATE")
         self.elapsed = self.update_rate + 1
@@ -33,11 +34,17 @@ class RunningFPS(Entity):
 
         self.elapsed += elapsed
         if self.elapsed > self.update_rate:
-            self.text = self.font.render("{:.0f}".format(globals.current_app.clock.get_fps()), True, (255, 255, 255))
+            self.elapsed = 0
+            fps = "{:.0f}".format(globals.current_app.clock.get_fps())
+            if fps == self.fps:
+                return
+            self.fps = fps
+            old_pos = self.text_pos
+            self.text = self.font.render(fps, True, (255, 255, 255))
             self.text_pos = self.text.get_rect()
             self.text_pos.centery = self.rect.centery
             self.text_pos.left = self.rect.left
-            self.elapsed = 0
+            self.request_redraw(self.text_pos if old_pos is None else self.text_pos.union(old_pos))
 
     def on_draw_after(self, surface):
         """
@@ -47,4 +54,5 @@ class RunningFPS(Entity):
         :return: None
         """
 
-        surface.blit(self.text, self.text_pos)
+        if self.text:
+            surface.blit(self.text, self.text_pos)
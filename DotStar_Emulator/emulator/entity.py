@@ -9,6 +9,19 @@ class Entity(object):
         :return:
         """
 
+        self.scene = None  # Scene the entity was added to
+
+    def request_redraw(self, rect=None):
+        """
+        Notify the scene that what the entity draws has changed.
+
+        :param rect: pygame.Rect in screen space that changed, default None draws the whole screen
+        :return: None
+        """
+
+        if self.scene:
+            self.scene.request_redraw(rect)
+
     def on_draw(self, surface):
         """
         Called every game loop. Draw or blit to the surface to draw the entity to the screen.
@@ -0,0 +1,103 @@
+"""
+Exposure of the strip, the light of every received frame accumulated the way an eye or a camera sees it.  POV and
+PWM effects stream far more frames than are displayed, showing only the latest frame hides what they look like.
+"""
+import math
+import threading
+
+import numpy
+
+from DotStar_Emulator.emulator.color_lut import BRIGHTNESS_MASK, brightness_scale, channel_selector
+
+__all__ = ["ExposureBuffer", ]
+
+
+class ExposureBuffer(object):
+
+    def __init__(self, pixel_count, rgb_channels, exposure_time, global_brightness=True):
+        """
+        Accumulate the light of every received frame into a float buffer that decays with time.  Each frame is
+        weighted by the time since the frame before it, and the exposure of earlier frames fades to 1/e every
+        exposure_time seconds, so frames streamed at any rate add up to the light they give off over that time.
+
+        Only observes frames while enabled, so the exposure costs nothing while it is not shown.
+
+        Only the data reader should observe.  Each frame is accumulated into a spare buffer that then replaces
+        accumulated under a lock, colors() reads under the same lock, so the main loop always reads a whole frame of
+        the exposure and the spare is never one being read.
+
+        :param pixel_count: `int` number of pixels in the strip
+        :param rgb_channels: `tuple` index of the red, green and blue byte, from color_order_channels
+        :param exposure_time: `float` seconds for the light of a frame to fade to 1/e
+        :param global_brightness: `bool` scale the light of each LED by its 5 bit global brightness, may be changed
+                                  while observing, the dot grid sets it when the global brightness is toggled
+        :return:
+        """
+
+        self.pixel_count = pixel_count
+        self.exposure_time = exposure_time
+        self.global_brightness = global_brightness
+        self.enabled = False
+
+        # Light of each LED, indexed [pixel][channel] like the pixel bytes, the control byte channel is unused.
+        # Keeping the layout of the pixel bytes converts them to floats in a single contiguous pass.
+        self.accumulated = numpy.zeros((pixel_count, 4), dtype=numpy.float32)
+        self._spare = numpy.zeros_like(self.accumulated)
+        self._light = numpy.zeros_like(self.accumulated)  # weighted light of the frame being observed
+        self._selector = channel_selector(rgb_channels)
+        self._scale = brightness_scale()
+        self._lock = threading.Lock()  # held while accumulated is replaced or read
+        self.last_time = None  # perf_counter time of the last observed frame
+
+    def enable(self, enabled):
+        """
+        Start or stop accumulating.  The exposure starts again from the first frame observed after enabling.
+
+        :param enabled: `bool`
+        :return: None
+        """
+
+        self.enabled = enabled
+        self.last_time = None
+
+    def observe(self, pixels, now):
+        """
+        Fade the exposure by the time since the last frame, and add the light of a frame, in a few vectorized
+        passes over the pixels.  Frames at full global brightness skip the per LED scaling.
+
+        :param pixels: contiguous numpy uint8 array of the strip pixels after the frame, indexed [pixel][channel]
+                       c, b, g, r
+        :param now: `float` perf_counter time the frame was received
+        :return: None
+        """
+
+        if self.last_time is None or self.exposure_time <= 0:
+            decay = 0.0
+        else:
+            decay = math.exp(-max(0.0, now - self.last_time) / self.exposure_time)
+        self.last_time = now
+
+        # Light of the frame, weighted by the time since the last frame
+        numpy.multiply(pixels.reshape(-1), numpy.float32(1.0 - decay), out=self._light.reshape(-1))
+        if self.global_brightness and self.pixel_count:
+            levels = pixels[:, 0] & BRIGHTNESS_MASK
+            if levels.min() != BRIGHTNESS_MASK:
+                self._light *= self._scale.take(levels)[:, None]
+
+        numpy.multiply(self.accumulated, numpy.float32(decay), out=self._spare)
+        self._spare += self._light
+        with self._lock:
+            self.accumulated, self._spare = self._spare, self.accumulated
+
+    def colors(self, indexes):
+        """
+        Exposed colors of LEDs.
+
+        :param indexes: numpy array of pixel indexes, of any shape
+        :return: numpy uint8 array of (r, g, b), the shape of indexes plus the color axis
+        """
+
+        with self._lock:
+            colors = self.accumulated.take(indexes, axis=0)[..., self._selector]
+        colors += 0.5
+        return colors.astype(numpy.uint8)
@@ -0,0 +1,107 @@
+"""
+Adaptive render quality.  The time taken to render and present each frame is watched, when frames take longer than
+the display budget the quality is stepped down one level at a time, and stepped back up once there is headroom.
+"""
+import logging
+
+import blinker
+
+from DotStar_Emulator.emulator import config
+
+log = logging.getLogger("app")
+
+__all__ = ["QualityGovernor", "QUALITY_LEVELS", "QUALITY_FULL", "QUALITY_NO_INDEXES", "QUALITY_NO_BORDERS",
+           "QUALITY_AGGREGATED", "QUALITY_REDUCED_RATE", ]
+
+# Quality levels, each leaves out more than the one before
+QUALITY_FULL = 0
+QUALITY_NO_INDEXES = 1  # LED index labels are not drawn
+QUALITY_NO_BORDERS = 2  # LED and perimeter borders are not drawn
+QUALITY_AGGREGATED = 3  # blocks of LEDs twice as large are aggregated into each grid cell
+QUALITY_REDUCED_RATE = 4  # the display is drawn at half the FPS limit
+
+# Name of each quality level
+QUALITY_LEVELS = ("Full", "No indexes", "No borders", "Aggregated", "Reduced rate")
+
+
+class QualityGovernor(object):
+
+    def __init__(self, enabled=True):
+        """
+        Step the render quality down and up from the render time of each frame.
+
+        The mean render time of every QUALITY_WINDOW frames is compared to the frame budget.  Above
+        QUALITY_DOWN_FRACTION of the budget the quality steps down.  Below QUALITY_UP_FRACTION of the budget for
+        QUALITY_UP_WINDOWS windows in a row it steps back up, the gap between the two keeps the quality from
+        flipping back and forth.
+
+        Trigger Blinker Event "quality.level" when the level changes.
+
+        :param enabled: `bool`, default=True, False keeps the quality at QUALITY_FULL
+        :return:
+        """
+
+        self.enabled = enabled
+
+        self.window = config.get("QUALITY_WINDOW")
+        self.down_fraction = config.get("QUALITY_DOWN_FRACTION")
+        self.up_fraction = config.get("QUALITY_UP_FRACTION")
+        self.up_windows = config.get("QUALITY_UP_WINDOWS")
+
+        self.level = QUALITY_FULL
+        self.total = 0.0  # seconds of the frames in the current window
+        self.count = 0  # frames in the current window
+        self.headroom = 0  # windows in a row below QUALITY_UP_FRACTION of the budget
+
+        self.level_changed = blinker.signal("quality.level")
+
+    @property
+    def name(self):
+        """
+        :return: `str` name of the current quality level
+        """
+
+        return QUALITY_LEVELS[self.level]
+
+    def observe(self, seconds, budget):
+        """
+        Add the render time of a frame, and step the quality at the end of each window.
+
+        :param seconds: `float` seconds taken to render and present the frame
+        :param budget: `float` seconds available for each frame at the display rate
+        :return: None
+        """
+
+        if not self.enabled:
+            return
+
+        self.total += seconds
+        self.count += 1
+        if self.count < self.window:
+            return
+
+        mean = self.total / self.count
+        self.total = 0.0
+        self.count = 0
+
+        if mean > budget * self.down_fraction:
+            self.headroom = 0
+            if self.level < QUALITY_REDUCED_RATE:
+                self.set_level(self.level + 1)
+        elif mean < budget * self.up_fraction:
+            self.headroom += 1
+            if self.headroom >= self.up_windows and self.level > QUALITY_FULL:
+                self.headroom = 0
+                self.set_level(self.level - 1)
+        else:
+            self.headroom = 0
+
+    def set_level(self, level):
+        """
+        :param level: `int` one of the QUALITY_ levels
+        :return: None
+        """
+
+        log.info("Render quality set to %s", QUALITY_LEVELS[level])
+        self.level = level
+        self.level_changed.send(self, level=level)
@@ -2,7 +2,7 @@ from DotStar_Emulator.emulator.vector2 import Vector2
 from .widget import Widget
 from .flags import *
 
-__all__ = ["SizedRows", "TwoColumns", "Grid", "TwoRows", "BasePanel"]
+__all__ = ["SizedRows", "TwoColumns", "Grid", "TwoRows", "BasePanel", "Pages"]
 
 
 class BasePanel(Widget):
@@ -436,3 +436,96 @@ class CenterSingle(BasePanel):
         """
 
         self.add_widget(widget)
+
+
+class Pages(BasePanel):
+
+    def __init__(self, use_surface=False, color=None):
+        """
+        A panel that fits each of its children widgets to its full size, but only draws the active one.  Useful
+        to flip between pages of information in the same space.
+
+        Only the active page is updated, and only its redraws are passed on.  A page catches up on the time it was
+        hidden when it is set active.
+
+        :param use_surface: `bool`, default=True, use a surface to render the widget
+        :param color: (r, g, b) or (r, g, b, a) or pygame.Color
+        :return:
+        """
+
+        super(Pages, self).__init__(use_surface=use_surface, color=color)
+
+        self.active = 0  # index of the page being drawn
+        self.hidden_elapsed = []  # milliseconds each page has not been updated for while hidden
+
+    def fit(self, possible_size, offset, global_offset, flags):
+        super(Pages, self).fit(possible_size, offset, global_offset, flags)
+        w_global_offset = global_offset + self.layout.total_offset
+
+        for widget in self._widgets:
+            widget.fit(self.layout.size, Vector2(0, 0), w_global_offset, FILLX | FILLY)
+
+    def set(self, widget):
+        """
+        Add a page.
+
+        :param widget: any class derived from gui.widget.Widget
+        :return: None
+        """
+
+        self.add_widget(widget)
+        # Hidden pages still mark themselves dirty, so they render when set active
+        widget.set_redraw_callback(lambda rect, page=widget: self.redraw_page(page, rect))
+        self.hidden_elapsed.append(0)
+
+    def redraw_page(self, page, rect):
+        """
+        Redraw callback of each page, only the active page is drawn.
+
+        :param page: the page widget that changed
+        :param rect: pygame.Rect in screen space that changed
+        :return: None
+        """
+
+        if page is self._widgets[self.active]:
+            self.redraw(rect)
+
+    def set_active(self, index):
+        """
+        Set the page to be drawn.
+
+        :param index: index of the page, in the order they were set.
+        :return: None
+        """
+
+        self.active = index
+        elapsed, self.hidden_elapsed[index] = self.hidden_elapsed[index], 0
+        if elapsed:
+            self._widgets[index].update(elapsed)
+        self.redraw()
+
+    def next(self):
+        """
+        Set the next page to be drawn, wrapping around to the first.
+
+        :return: None
+        """
+
+        self.set_active((self.active + 1) % len(self._widgets))
+
+    def update(self, elapsed):
+        for i, widget in enumerate(self._widgets):
+            if i == self.active:
+                widget.update(elapsed)
+            else:
+                self.hidden_elapsed[i] += elapsed
+
+    def on_render(self):
+        self.surface.fill(self.color)
+        self._widgets[self.active].on_draw(self.surface, Vector2(0, 0))
+
+    def on_draw(self, surface, g_offset):
+        if self.use_surface:
+            super(BasePanel, self).on_draw(surface, g_offset)
+        else:
+            self._widgets[self.active].on_draw(surface, self.layout.total_offset + g_offset)
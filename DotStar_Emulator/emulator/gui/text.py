@@ -47,6 +47,8 @@ class TextLabelWidget(Widget):
         :return: None
         """
 
+        if value == self._text:
+            return
         self._text = value
         self.redraw()
 
@@ -228,24 +228,26 @@ class Widget(object):
     def set_redraw_callback(self, callback):
         """
         When a widget becomes dirty, the widget needs to tell its parent widget that the it is dirty.
-        Widget.redraw() will call this function if it is set.
+        Widget.redraw() will call this function if it is set, with the screen space pygame.Rect that changed.
 
-        :param callback: function
+        :param callback: function taking a pygame.Rect
         :return: None
         """
 
         self._redraw_callback = callback
 
-    def redraw(self):
+    def redraw(self, rect=None):
         """
-        Set the widget as dirty, so next on_draw call will call render.  Also notify parent if redraw_callback is set.
+        Set the widget as dirty, so next on_draw call will call render.  Also notify parent if redraw_callback is set,
+        passing along the screen space rect that changed so only that part of the screen is drawn again.
 
+        :param rect: pygame.Rect in screen space, default None is the whole widget, Widget.layout.global_rect
         :return: None
         """
 
         self._dirty = True
         if self._redraw_callback:
-            self._redraw_callback()
+            self._redraw_callback(rect if rect is not None else self.layout.global_rect)
 
     def render(self):
         """
@@ -9,6 +9,22 @@
 # display in full screen mode
 # FULL_SCREEN = True
 
+# Highest rate the display is drawn at, changed with the [F] FPS button.  Every received frame is still recorded
+# and counted, frames that arrive faster than this are not displayed, and are counted on the [P] Perf page.
+# DISPLAY_FPS = 60
+
+# Wait for pygame events and only draw when a frame was received or the gui changed, instead of drawing at the
+# [F] FPS rate.  The FPS setting is still the highest rate the display is drawn.  Needs pygame 2
+# EVENT_LOOP = True
+
+# Longest time in milliseconds to wait for an event, timers and animations update at least this often
+# EVENT_LOOP_TIMEOUT = 100
+
+
+# Step the render quality down when drawing a frame takes longer than the FPS allows: index labels off, borders off,
+# blocks of LEDs aggregated into each cell, then half the display rate.  Steps back up when there is headroom again.
+# QUALITY_GOVERNOR = True
+
 
 ######################################################################################
 #
@@ -28,6 +44,29 @@
 # Take up whole screen space by having LED's stretch to fill the space.
 # SQUARE_LED = False
 
+# Show the grid position, strip index and color of the LED under the mouse cursor
+# HOVER_INSPECTOR = True
+
+# Zoomed out past 1 pixel per LED, each block of LEDs is shown as the "mean" or the "max" of their colors
+# DOT_GRID_AGGREGATE = "mean"
+
+# Scale each LED by the APA102 global brightness, the low 5 bits of its control byte, as the hardware does.
+# Toggled with the G key
+# GLOBAL_BRIGHTNESS = True
+
+# Order the strip receives the color bytes in, after the control byte of each pixel.  APA102 strips are "BGR",
+# others come as "RGB", "GRB", "RBG", "BRG" or "GBR"
+# COLOR_ORDER = "BGR"
+
+# LEDs give off light in proportion to each color value, a screen does not.  A gamma of 2.2 shows dim colors as
+# bright as the LEDs show them, 1.0 shows the color values as they are
+# GAMMA = 1.0
+
+# The E key shows the light of every received frame accumulated, as an eye or a camera sees POV and PWM effects
+# streamed faster than the display rate.  The light of each frame fades to 1/e over EXPOSURE_TIME seconds, about
+# 0.05 for the eye, or the shutter time of a camera
+# EXPOSURE_TIME = 0.05
+
 
 ######################################################################################
 #
@@ -90,6 +129,74 @@
 # Change port number of TCP connection
 # PORT = 6555
 
+# Check each received frame for a zero start frame, the 0b111 marker of every control byte, a pixel for every LED
+# and a long enough end frame.  Bad frames are still displayed, and counted on the [P] Perf page and in the metrics
+# FRAME_VALIDATION = True
+
+######################################################################################
+#
+# Frame Analytics
+#
+
+# Estimate the current drawn by each received frame, and the histogram of LED brightness, on a background thread
+# FRAME_ANALYTICS = True
+
+# mA drawn by the red, green and blue of an LED at 255 and full global brightness, and by an LED with every color off
+# POWER_CHANNEL_MA = (20.0, 20.0, 20.0)
+# POWER_IDLE_MA = 1.0
+
+# mA the power supply can give.  The power draw is shown in red while over it, frames over it are counted and logged
+# POWER_BUDGET_MA = 4000
+
+# Count how often each LED changed over the last ACTIVITY_WINDOW received frames, and the pixel bytes that repeat
+# what the LED already shows.  The H key shows the counts as a heatmap over the grid
+# ACTIVITY_TRACKING = True
+# ACTIVITY_WINDOW = 120
+
+######################################################################################
+#
+# Frame History
+#
+
+# The last HISTORY_FRAMES received frames are kept, as long as they fit in HISTORY_MAX_MB.
+#   [Space] pause / resume, [,] [.] step back / forward, [Page Up] [Page Down] scrub, [Home] [End] oldest / newest
+# HISTORY_FRAMES = 600
+# HISTORY_MAX_MB = 64
+
+######################################################################################
+#
+# Headless Settings, manage.py run --headless
+#
+
+# Seconds between the logged frame and byte throughput statistics
+# HEADLESS_STATS_INTERVAL = 5
+
+######################################################################################
+#
+# Performance Information
+#
+
+# Number of main loop and packet timings kept for the averages and p99 shown on the [P] Perf page
+# TIMING_SAMPLES = 240
+
+# Packet rate and jitter are calculated over the last RATE_WINDOW seconds, from up to RATE_SAMPLES arrival times
+# RATE_SAMPLES = 4096
+# RATE_WINDOW = 1.0
+
+# A packet interval RATE_GAP_FACTOR times the median is counted as a gap, and the stream is shown as stalled
+# after RATE_STALL_SECONDS without a packet
+# RATE_GAP_FACTOR = 4.0
+# RATE_STALL_SECONDS = 1.0
+
+######################################################################################
+#
+# Metrics endpoint
+#
+
+# Serve Prometheus style metrics at http://METRICS_HOST:METRICS_PORT/metrics, disabled by default
+# METRICS_HOST = '127.0.0.1'
+# METRICS_PORT = 9108
+
 ######################################################################################
 #
 # Logging Configurations
@@ -0,0 +1,191 @@
+"""
+Prometheus style metrics endpoint, served on localhost from its own thread.
+
+Metrics are read straight from the counters the emulator already keeps.  Nothing is locked, so a scrape never
+blocks the main loop or the data reader, at worst a scrape sees counters from slightly different moments.
+"""
+import threading
+import logging
+
+try:
+    from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+except ImportError:
+    from http.server import HTTPServer, BaseHTTPRequestHandler
+
+from DotStar_Emulator.emulator import globals
+
+log = logging.getLogger("metrics")
+
+__all__ = ["MetricsServer", "collect"]
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+def _counter(lines, name, text, value):
+    lines.append("# HELP {} {}".format(name, text))
+    lines.append("# TYPE {} counter".format(name))
+    lines.append("{} {}".format(name, value))
+
+
+def _gauge(lines, name, text, value):
+    lines.append("# HELP {} {}".format(name, text))
+    lines.append("# TYPE {} gauge".format(name))
+    lines.append("{} {}".format(name, value))
+
+
+def _labeled_gauge(lines, name, text, label, values):
+    lines.append("# HELP {} {}".format(name, text))
+    lines.append("# TYPE {} gauge".format(name))
+    for label_value, value in values:
+        lines.append('{}{{{}="{}"}} {}'.format(name, label, label_value, value))
+
+
+def _histogram(lines, name, text, histogram):
+    lines.append("# HELP {} {}".format(name, text))
+    lines.append("# TYPE {} histogram".format(name))
+    for bound, count in histogram.cumulative():
+        le = "+Inf" if bound == float("inf") else repr(bound)
+        lines.append('{}_bucket{{le="{}"}} {}'.format(name, le, count))
+    lines.append("{}_sum {!r}".format(name, histogram.sum))
+    lines.append("{}_count {}".format(name, histogram.count))
+
+
+def collect():
+    """
+    Gather the current metrics of the running emulator.
+
+    :return: `str` metrics in the Prometheus text exposition format
+    """
+
+    app = globals.current_app
+    strip_data = globals.strip_data
+
+    lines = []
+    _counter(lines, "dotstar_frames_received_total", "Frames received from clients.", strip_data.frame_count)
+    _counter(lines, "dotstar_bytes_received_total", "Bytes received from clients.", strip_data.byte_count)
+    _counter(lines, "dotstar_frames_rendered_total", "Main loop iterations that rendered the display.",
+             app.frames_rendered)
+    _counter(lines, "dotstar_frames_displayed_total", "Received frames that were passed on to be displayed.",
+             strip_data.frames_displayed)
+    _counter(lines, "dotstar_frames_dropped_total",
+             "Received frames that were replaced by a newer frame, or recorded while paused, before being displayed.",
+             strip_data.frames_not_displayed)
+    _counter(lines, "dotstar_frames_malformed_total",
+             "Received frames without a zero start frame, or with a control byte missing its 0b111 marker.",
+             strip_data.malformed_frames)
+    _counter(lines, "dotstar_frames_wrong_length_total",
+             "Received frames with fewer pixels than the strip, or longer than a full frame.",
+             strip_data.wrong_length_frames)
+    _counter(lines, "dotstar_frames_short_end_total",
+             "Received frames with every pixel, but an end frame too short to latch the last pixels.",
+             strip_data.short_end_frames)
+    _gauge(lines, "dotstar_packet_rate_hz", "Frames received per second over RATE_WINDOW.",
+           strip_data.arrivals.rate())
+    jitter = strip_data.arrivals.jitter() or {}
+    _gauge(lines, "dotstar_frame_interval_p50_seconds", "Median time between frames over RATE_WINDOW.",
+           jitter.get("p50", 0))
+    _gauge(lines, "dotstar_frame_interval_p99_seconds", "99th percentile time between frames over RATE_WINDOW.",
+           jitter.get("p99", 0))
+    _gauge(lines, "dotstar_frame_jitter_seconds", "p99 minus p50 time between frames over RATE_WINDOW.",
+           jitter.get("jitter", 0))
+    _gauge(lines, "dotstar_frame_gaps", "Intervals over RATE_WINDOW longer than RATE_GAP_FACTOR times the median.",
+           jitter.get("gaps", 0))
+    _gauge(lines, "dotstar_stalled", "1 if no frame was received for RATE_STALL_SECONDS.",
+           1 if strip_data.arrivals.stalled() else 0)
+    _gauge(lines, "dotstar_render_quality_level", "Render quality level, 0 is full quality.", app.governor.level)
+    _gauge(lines, "dotstar_connected_clients", "Clients currently connected.", app.data_reader.connected_clients)
+    _histogram(lines, "dotstar_frame_interarrival_seconds", "Time between received frames.",
+               strip_data.interarrival)
+    _histogram(lines, "dotstar_render_seconds", "Time taken to draw the scene.", app.render_histogram)
+
+    analytics = app.analytics
+    if analytics:
+        _counter(lines, "dotstar_frames_analyzed_total", "Received frames the power draw was estimated for.",
+                 analytics.frames_analyzed)
+        _counter(lines, "dotstar_frames_over_budget_total", "Analyzed frames estimated over POWER_BUDGET_MA.",
+                 analytics.frames_over_budget)
+        _gauge(lines, "dotstar_power_milliamps", "Estimated current of the last analyzed frame.",
+               analytics.last_ma or 0)
+        _gauge(lines, "dotstar_power_average_milliamps", "Mean estimated current over POWER_SAMPLES frames.",
+               analytics.power.mean() or 0)
+        _gauge(lines, "dotstar_power_peak_milliamps", "Highest estimated current of any analyzed frame.",
+               analytics.peak_ma)
+        _gauge(lines, "dotstar_power_over_budget", "1 if the last analyzed frame was over POWER_BUDGET_MA.",
+               1 if analytics.over_budget else 0)
+        width = 256 // analytics.bins
+        _labeled_gauge(lines, "dotstar_leds_by_brightness",
+                       "LEDs of the last analyzed frame by the value of their brightest color.", "brightness",
+                       [("{}-{}".format(i * width, (i + 1) * width - 1), count)
+                        for i, count in enumerate(analytics.histogram.tolist())])
+
+    activity = strip_data.activity
+    if activity:
+        _counter(lines, "dotstar_pixel_bytes_total", "Pixel bytes of received frames, start and end frames left out.",
+                 activity.pixel_bytes_total)
+        _counter(lines, "dotstar_redundant_pixel_bytes_total",
+                 "Pixel bytes of received frames that repeat the pixel of the previous frame.",
+                 activity.redundant_bytes_total)
+        _gauge(lines, "dotstar_redundant_bytes_per_frame",
+               "Mean redundant pixel bytes of a frame over ACTIVITY_WINDOW frames.", activity.redundant_bytes.mean() or 0)
+
+    return "\n".join(lines) + "\n"
+
+
+class MetricsHandler(BaseHTTPRequestHandler):
+
+    def do_GET(self):
+        if self.path.split("?")[0] not in ("/", "/metrics"):
+            self.send_error(404)
+            return
+
+        body = collect().encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", CONTENT_TYPE)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        log.debug(format, *args)
+
+
+class MetricsServer(threading.Thread):
+
+    def __init__(self, host, port):
+        """
+        Serve the metrics over HTTP in its own thread.
+
+        METRICS_HOST and METRICS_PORT set in config.
+
+        :param host: `str` host to bind to
+        :param port: `int` port to bind to
+        :return:
+        """
+
+        super(MetricsServer, self).__init__()
+        self.daemon = True
+
+        self.host = host
+        self.port = port
+        self.server = HTTPServer((host, port), MetricsHandler)
+
+    def run(self):
+        """
+        Serve requests until stop is called.
+
+        :return: None
+        """
+
+        log.info("Serving metrics on 'http://%s:%s/metrics'", self.host, self.port)
+        self.server.serve_forever(poll_interval=0.5)
+
+    def stop(self):
+        """
+        Stop serving and close the socket.
+
+        :return: None
+        """
+
+        if self.is_alive():
+            self.server.shutdown()
+        self.server.server_close()
@@ -0,0 +1,126 @@
+from bisect import bisect_left
+
+from DotStar_Emulator.emulator.stats import RingBuffer, percentile, perf_counter
+
+
+class RateEstimator(object):
+
+    def __init__(self, samples, window, gap_factor, stall_seconds):
+        """
+        Estimate the frequency and timing of incoming SPI packets from a ring buffer of arrival timestamps.
+
+        record is called by the data reader thread for each packet, and only stores the timestamp.  The rate,
+        inter-arrival percentiles and gaps are computed from a copy of the buffer when they are asked for, so
+        there is no lock and no extra thread.
+
+        :param samples: `int` number of arrival timestamps kept
+        :param window: `float` seconds of arrivals the rate and jitter are computed over
+        :param gap_factor: `float` an interval this many times the median interval is a gap
+        :param stall_seconds: `float` seconds without a packet before the stream is stalled
+        :return:
+        """
+
+        self.arrivals = RingBuffer(samples)
+        self.window = window
+        self.gap_factor = gap_factor
+        self.stall_seconds = stall_seconds
+
+    def record(self, timestamp):
+        """
+        Record the arrival of a packet.
+
+        :param timestamp: `float` perf_counter time the packet arrived
+        :return: None
+        """
+
+        self.arrivals.append(timestamp)
+
+    @property
+    def count(self):
+        """
+        :return: `int` total number of packets recorded
+        """
+
+        return self.arrivals.count
+
+    def recent(self, now=None):
+        """
+        :param now: `float` perf_counter time, default is now
+        :return: (`list` of arrival timestamps within the window, `bool` True if the buffer holds less than the
+                 window)
+        """
+
+        now = perf_counter() if now is None else now
+
+        # The reader thread may overwrite the oldest slot while it is copied, sorting puts it back in place.
+        times = self.arrivals.values()
+        times.sort()
+
+        i = bisect_left(times, now - self.window)
+        truncated = i == 0 and len(times) == self.arrivals.size
+        return times[i:], truncated
+
+    def intervals(self, now=None):
+        """
+        :param now: `float` perf_counter time, default is now
+        :return: `list` of seconds between the packets within the window
+        """
+
+        times, truncated = self.recent(now)
+        return [b - a for a, b in zip(times, times[1:])]
+
+    def rate(self, now=None):
+        """
+        :param now: `float` perf_counter time, default is now
+        :return: `float` packets per second over the window
+        """
+
+        times, truncated = self.recent(now)
+        if truncated and len(times) > 1 and times[-1] > times[0]:
+            # More packets arrived within the window than the buffer holds
+            return (len(times) - 1) / (times[-1] - times[0])
+        return len(times) / self.window
+
+    def since_last(self, now=None):
+        """
+        :param now: `float` perf_counter time, default is now
+        :return: `float` seconds since the last packet, None if no packet was received
+        """
+
+        if not self.arrivals.count:
+            return None
+        now = perf_counter() if now is None else now
+        return now - self.arrivals.data[(self.arrivals.count - 1) % self.arrivals.size]
+
+    def stalled(self, now=None):
+        """
+        :param now: `float` perf_counter time, default is now
+        :return: `bool` True if packets were being received, but none arrived for STALL_SECONDS
+        """
+
+        since_last = self.since_last(now)
+        return since_last is not None and since_last > self.stall_seconds
+
+    def jitter(self, now=None):
+        """
+        Inter-arrival statistics over the window.
+
+        :param now: `float` perf_counter time, default is now
+        :return: `dict` of p50, p90, p99 and max interval, jitter (p99 - p50) in seconds and number of gaps.
+                 None if there are not enough packets in the window.
+        """
+
+        intervals = self.intervals(now)
+        if not intervals:
+            return None
+
+        p50 = percentile(intervals, 50)
+        p99 = percentile(intervals, 99)
+        return {
+            "p50": p50,
+            "p90": percentile(intervals, 90),
+            "p99": p99,
+            "max": max(intervals),
+            "jitter": p99 - p50,
+            "gaps": sum(1 for i in intervals if i > p50 * self.gap_factor),
+        }
@@ -1,5 +1,9 @@
+from pygame import Rect
+
 from .vector2 import Vector2
 from . import globals
+from . import config
+from .utils import merge_rects
 
 from .gui import FILLX, FILLY
 
@@ -16,6 +20,13 @@ class Scene(object):
         self.panel = None
         self._entities = []
 
+        # Set when the gui or an entity changed and the scene needs to be drawn again
+        self.needs_redraw = True
+        # Screen space rects that changed since the last draw, or full_redraw to draw the whole screen
+        self.dirty_rects = []
+        self.full_redraw = True
+        self.max_dirty_rects = config.get("MAX_DIRTY_RECTS")
+
     def add_entity(self, entity):
         """
         Entities are non gui/widget objects that will be rendered and updated.
@@ -24,6 +35,7 @@ class Scene(object):
         :return: None
         """
         self._entities.append(entity)
+        entity.scene = self
 
     def update(self, elapsed):
         """
@@ -39,7 +51,38 @@ class Scene(object):
 
     def on_draw(self, surface):
         """
-        Root on_draw method called directly from the game loop.
+        Root on_draw method called directly from the game loop.  Only the dirty rects are drawn again, each one by
+        clipping the surface to it and drawing the gui and entities, so anything that overlaps it is restored.
+
+        :param surface: pygame.Surface
+        :return: `list` of pygame.Rect that were drawn, or None if the whole surface was drawn
+        """
+
+        rects = None
+        if not self.full_redraw:
+            rects = merge_rects(self.dirty_rects, surface.get_rect())
+            if len(rects) > self.max_dirty_rects:
+                rects = None
+
+        self.needs_redraw = False
+        self.full_redraw = False
+        self.dirty_rects = []
+
+        if rects is None:
+            surface.fill((0, 0, 0))
+            self.draw(surface)
+            return None
+
+        for rect in rects:
+            surface.set_clip(rect)
+            surface.fill((0, 0, 0))
+            self.draw(surface)
+        surface.set_clip(None)
+        return rects
+
+    def draw(self, surface):
+        """
+        Draw the entities and gui to the surface.
 
         :param surface: pygame.Surface
         :return: None
@@ -64,6 +107,21 @@ class Scene(object):
         :return: None
         """
         self.panel = panel
+        # Any widget redraw is passed up to the root panel, which adds the rect that changed to the dirty rects
+        panel.set_redraw_callback(self.request_redraw)
+
+    def request_redraw(self, rect=None):
+        """
+        Mark the scene as changed, so the main loop draws it on its next iteration.
+
+        :param rect: pygame.Rect in screen space that changed, default None draws the whole screen
+        :return: None
+        """
+        self.needs_redraw = True
+        if rect is None:
+            self.full_redraw = True
+        else:
+            self.dirty_rects.append(Rect(rect))
 
     def fit(self):
         """
@@ -8,8 +8,12 @@ from DotStar_Emulator.emulator.gui import TextLabelWidget, ButtonWidget
 from DotStar_Emulator.emulator.widgets.logo import LogoWidget
 from DotStar_Emulator.emulator.widgets.dotgrid import DotGridWidget
 from DotStar_Emulator.emulator.widgets.running_info import RunningInfo
+from DotStar_Emulator.emulator.widgets.performance_info import PerformanceInfo
 from DotStar_Emulator.emulator.entities.dotgrid_select import DotGridSelect
+from DotStar_Emulator.emulator.entities.dotgrid_hover import DotGridHover
 from DotStar_Emulator.emulator.entities.running_fps import RunningFPS
+from DotStar_Emulator.emulator.entities.frame_history import FrameHistoryControl
+from DotStar_Emulator.emulator.entities.activity_summary import ActivitySummary
 
 
 class RunningScene(Scene):
@@ -39,8 +43,13 @@ class RunningScene(Scene):
         right2 = panels.TwoRows(-60)
         right.set_bottom(right2)
 
+        # Information pages, flipped through with the [P] button
+        self.info_pages = panels.Pages()
+        right2.set_top(self.info_pages)
+
         running_info = RunningInfo()
-        right2.set_top(running_info)
+        self.info_pages.set(running_info)
+        self.info_pages.set(PerformanceInfo())
         right2.set_bottom(self.bottom_right_panel())
 
         self.fit()
@@ -48,6 +57,14 @@ class RunningScene(Scene):
         select = DotGridSelect(self.dotgrid)
         self.add_entity(select)
 
+        self.add_entity(FrameHistoryControl(self.dotgrid))
+
+        if globals.strip_data.activity is not None:
+            self.add_entity(ActivitySummary(self.dotgrid))
+
+        if config.get("HOVER_INSPECTOR"):
+            self.add_entity(DotGridHover(self.dotgrid))
+
         rect = running_info.emulator_fps_txt.layout.global_rect
         self.add_entity(RunningFPS(rect))
 
@@ -87,6 +104,10 @@ class RunningScene(Scene):
         bottom.set(edit_button, 1, 0)
         blinker.signal("gui.button.pressed").connect(self.on_draw_indexes, sender=edit_button)
 
+        perf_button = ButtonWidget("[P] Perf", key=pygame.K_p)
+        bottom.set(perf_button, 2, 0)
+        blinker.signal("gui.button.pressed").connect(self.on_perf, sender=perf_button)
+
         exit_button = ButtonWidget("[X] Exit", key=pygame.K_x)
         bottom.set(exit_button, 2, 1)
         blinker.signal("gui.button.pressed").connect(self.on_exit, sender=exit_button, weak=True)
@@ -190,6 +211,16 @@ class RunningScene(Scene):
 
         sender.text = self.fps_text()
 
+    def on_perf(self, sender):
+        """
+        Callback for the Perf button pressed event, flip between the information and performance pages.
+
+        :param sender: blinker sender
+        :return: None
+        """
+
+        self.info_pages.next()
+
     def on_exit(self, sender):
         """
         Callback for the Exit button pressed event
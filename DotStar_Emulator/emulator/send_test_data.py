@@ -77,12 +77,12 @@ class App(object):
     def send(self):
 
         if not self.connection:
-            if os.environ.has_key('DOTSTAR_HOST'):
+            if 'DOTSTAR_HOST' in os.environ:
                 host = os.environ.get('DOTSTAR_HOST')
             else:
                 host = config.get("HOST")
-            if os.environ.has_key('DOTSTAR_PORT'):
-                port = os.environ.get('DOTSTAR_PORT')
+            if 'DOTSTAR_PORT' in os.environ:
+                port = int(os.environ.get('DOTSTAR_PORT'))
             else:
                 port = config.get("PORT")
 
@@ -94,9 +94,9 @@ class App(object):
         out_buffer += self.data
 
         if self.pixel_count:
-            footerLen = (self.pixel_count + 15) / 16
+            footerLen = (self.pixel_count + 15) // 16
         else:
-            footerLen = ((len(self.data) / 4) + 15) / 16
+            footerLen = ((len(self.data) // 4) + 15) // 16
         fBuf = bytearray()
         for i in range(int(footerLen)):
             # This is different than AdaFruit library, which uses zero's in the xfer[2] spi_ioc_transfer struct.
@@ -162,7 +162,6 @@ class FillApp(App):
 
     def fill(self, b, r, g):
         for index in range(self.mapping_data.pixel_count):
-            print(index)
             self.set(index, 0xFF, b, g, r)
 
     def on_loop(self):
@@ -0,0 +1,139 @@
+"""
+Timing and statistics helpers shared by the emulator and the benchmarks.
+"""
+from array import array
+from bisect import bisect_left
+
+try:
+    from time import perf_counter
+except ImportError:
+    from time import time as perf_counter
+
+__all__ = ["perf_counter", "percentile", "RingBuffer", "Histogram", ]
+
+
+def percentile(values, p):
+    """
+    Return the p'th percentile of values, using the nearest rank method.
+
+    :param values: sequence of numbers, does not need to be sorted
+    :param p: percentile between 0 and 100
+    :return: value at the percentile, or None if values is empty
+    """
+
+    if not values:
+        return None
+
+    ordered = sorted(values)
+    rank = int(round(p / 100.0 * (len(ordered) - 1)))
+    return ordered[rank]
+
+
+class RingBuffer(object):
+
+    def __init__(self, size):
+        """
+        Fixed size buffer of the most recent float values, used to keep timings without allocating.
+
+        There is no lock, only a single thread should append.  Other threads may read, values() takes a copy.
+
+        :param size: `int` number of values kept
+        :return:
+        """
+
+        self.size = size
+        self.data = array("d", [0.0]) * size
+        self.count = 0  # total number of values ever appended
+
+    def append(self, value):
+        """
+        :param value: `float`, overwrites the oldest value once the buffer is full
+        :return: None
+        """
+
+        self.data[self.count % self.size] = value
+        self.count += 1
+
+    def __len__(self):
+        return min(self.count, self.size)
+
+    def values(self):
+        """
+        :return: `list` copy of the stored values, oldest first
+        """
+
+        count = self.count
+        if count <= self.size:
+            return self.data[:count].tolist()
+        i = count % self.size
+        return (self.data[i:] + self.data[:i]).tolist()
+
+    def since(self, count):
+        """
+        Values appended since the buffer held count values, limited to the values still stored.
+
+        :param count: `int` a previous value of RingBuffer.count
+        :return: (`list` of values oldest first, `int` count to pass to the next call)
+        """
+
+        end = self.count
+        start = max(count, end - self.size)
+        return [self.data[i % self.size] for i in range(start, end)], end
+
+    def mean(self):
+        """
+        :return: `float` mean of the stored values, None if empty
+        """
+
+        values = self.values()
+        if not values:
+            return None
+        return sum(values) / len(values)
+
+    def percentile(self, p):
+        """
+        :param p: percentile between 0 and 100
+        :return: `float` p'th percentile of the stored values, None if empty
+        """
+
+        return percentile(self.values(), p)
+
+
+class Histogram(object):
+
+    def __init__(self, buckets):
+        """
+        Cumulative histogram of observed values, in the style of a Prometheus histogram.
+
+        There is no lock, only a single thread should observe.  Other threads may read the counts.
+
+        :param buckets: sequence of bucket upper bounds, values larger than the last go into a +Inf bucket
+        :return:
+        """
+
+        self.buckets = tuple(sorted(buckets))
+        self.counts = array("L", [0]) * (len(self.buckets) + 1)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        """
+        :param value: `float` value to count
+        :return: None
+        """
+
+        self.counts[bisect_left(self.buckets, value)] += 1
+        self.sum += value
+        self.count += 1
+
+    def cumulative(self):
+        """
+        :return: `list` of (upper bound, number of values less than or equal to it), the last bound is +Inf
+        """
+
+        result = []
+        total = 0
+        for bound, count in zip(self.buckets + (float("inf"), ), self.counts.tolist()):
+            total += count
+            result.append((bound, total))
+        return result
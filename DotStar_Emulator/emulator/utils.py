@@ -42,3 +42,27 @@ def vector2_to_int(v2):
     """
 
     return int(v2.x), int(v2.y)
+
+
+def merge_rects(rects, bounds):
+    """
+    Merge overlapping rectangles, so no area is drawn twice.  Each rectangle is clipped to bounds.
+
+    :param rects: `list` of pygame.Rect
+    :param bounds: pygame.Rect, such as the screen surface rect
+    :return: `list` of pygame.Rect that do not overlap
+    """
+
+    merged = []
+    for rect in rects:
+        rect = rect.clip(bounds)
+        if not rect.width or not rect.height:
+            continue
+
+        # Grow the rect by any it overlaps, until it overlaps none of the merged rects
+        index = rect.collidelist(merged)
+        while index != -1:
+            rect.union_ip(merged.pop(index))
+            index = rect.collidelist(merged)
+        merged.append(rect)
+    return merged
@@ -1,17 +1,21 @@
 import logging
+import math
 
+import numpy
 import pygame
+import pygame.surfarray
 from pygame import Rect
 import blinker
 
 from DotStar_Emulator.emulator.vector2 import Vector2
 from DotStar_Emulator.emulator import config, globals
 from DotStar_Emulator.emulator.gui.widget import Widget
+from DotStar_Emulator.emulator.color_lut import apply_brightness, channel_selector, gamma_lut, HEAT_LUT
+from DotStar_Emulator.emulator.governor import QUALITY_NO_INDEXES, QUALITY_NO_BORDERS, QUALITY_AGGREGATED
 from DotStar_Emulator.emulator.utils import vector2_to_floor, vector2_to_int
 
 log = logging.getLogger("app")
 
-
 class DotGridWidget(Widget):
     def __init__(self, use_surface=True):
         """
@@ -20,6 +24,25 @@ class DotGridWidget(Widget):
         Renders each LED in a x, y grid fashion.  Each grid cell is a LED.  Each grid cell can have its own borders.
         The main grid can also have a grid.
 
+        The grid is composited from three cached layers, each rebuilt only when what it shows changes.  The LED
+        layer holds the LED colors, the background layer the borders and unmapped cells with the mapped LEDs cut
+        out, and the index layer the LED indexes.
+
+        The grid is shown through a view that is zoomed with the mouse wheel, or the +, - and 0 keys, and panned by
+        dragging with the middle or right mouse button.  Only the LEDs inside the view are rendered.  When an LED
+        would be smaller than a pixel, blocks of LEDs are aggregated into a single grid cell, by the mean or max
+        of their colors as set by DOT_GRID_AGGREGATE.
+
+        The quality.level signal of the QualityGovernor leaves out the indexes, then the borders, then aggregates
+        blocks twice as large, without changing the DRAW_BORDERS and DRAW_INDEXES settings.
+
+        Each LED is scaled by the APA102 global brightness in its control byte, toggled with the G key.  The color
+        bytes are read in COLOR_ORDER, and shown through the GAMMA lookup table.
+
+        The H key shows the activity of each LED, how often it changed over the last received frames, as a heatmap
+        over the dimmed LED colors.  The E key shows the exposure, the light of every received frame accumulated
+        over EXPOSURE_TIME, instead of the latest frame.
+
         Configuration [
             'GRID_SIZE': (x, y),  # Grid size
             'BORDER_SIZE': (x, y),  # Pixel size of the border drawn around each LED
@@ -39,34 +62,131 @@ class DotGridWidget(Widget):
 
         self.grid_size = None  # Number Columns, Rows of the grid
         self.cell_size = None  # Pixel size of each grid cell
+        self.fit_cell_size = None  # Pixel size of an LED that fits the whole grid in the widget, may be below 1
+        self.block = 1  # Columns and rows of LEDs aggregated into each grid cell
+
+        self.zoom = 1.0  # Scale of the view, 1.0 fits the whole grid in the widget
+        self.view = Vector2(0, 0)  # LED column, row at the top left of the view
+        self.view_start = None  # Grid cell column, row at the top left of the view
+        self.visible_size = None  # Number of grid cell Columns, Rows inside the view
 
-        self.led_surface = None  # Reusable surface to render LEDs
         self.led_size = None  # Pixel size of the colored led inside the grid cell
         self.border_size = None  # Pixel size of the border to draw around the LED inside the grid cell
         self.grid_background_position = None  # pixel offset of background surface
-        self.grid_background_surface = None  # background surface
+        self.grid_background_surface = None  # background layer, transparent where the mapped LEDs show through
+        self.grid_position = None  # pixel offset of the first grid cell, inside the perimeter border
+        self.led_layer = None  # LED colors layer, each LED color fills its whole grid cell
+        self.led_layer_stale = True  # led_layer needs to be updated from strip_data before it is drawn
+        self._led_pixels = None  # one pixel per visible grid cell, scaled up to the led_layer
         self.perimeter_border_size = None  # pixel size of perimeter border
-        self.led_rects = None  # Cache the Rects of the LEDs, positioned to this widget
-        self.grid_rects = None  # Cache the Rects of the grid Rects, position to this widget
+        self.index_layer = None  # Transparent surface of every LED's index, built when first drawn
 
         self.draw_borders = config.get("DRAW_BORDERS")  # Borders around each LED can be toggled on and off
         self.draw_indexes = config.get("DRAW_INDEXES")  # Borders around each LED can be toggled on and off
         self.draw_indexes_colors = config.get("DRAW_INDEXES_COLORS")
+        self.quality = 0  # Render quality level set by the QualityGovernor
+        self.global_brightness = config.get("GLOBAL_BRIGHTNESS")  # Scale LEDs by their 5 bit global brightness
+        self.rgb_channels = globals.strip_data.rgb_channels  # Index of the red, green and blue byte
+        self._rgb_selector = channel_selector(self.rgb_channels)
+        self.gamma_lut = gamma_lut(config.get("GAMMA"))  # Displayed value of each color value, None to show as is
+        self.heatmap = False  # Show the activity of each LED over its color, toggled with the H key
+
+        # Only the changed LEDs are painted, unless more than this fraction changed
+        self.full_repaint = config.get("DOT_GRID_FULL_REPAINT")
+        self.max_dirty_rects = config.get("MAX_DIRTY_RECTS")
+
+        self.aggregate = config.get("DOT_GRID_AGGREGATE")
+        self.zoom_step = config.get("DOT_GRID_ZOOM_STEP")
+        self.min_visible = config.get("DOT_GRID_MIN_VISIBLE")
+        self.view_changed = blinker.signal("dotgrid.view.changed")
 
         # connect to signal used to toggle the borders.
         blinker.signal("dotgrid.drawborders").connect(self.on_drawborders)
         blinker.signal("dotgrid.drawindexes").connect(self.on_drawindexs)
         blinker.signal("stripdata.updated").connect(self.on_data_updated)
+        blinker.signal("event.mousebuttondown").connect(self.on_mousebuttondown)
+        blinker.signal("event.mousemotion").connect(self.on_mousemotion)
+        blinker.signal("event.keydown").connect(self.on_keydown)
+        blinker.signal("quality.level").connect(self.on_quality)
+
+    @property
+    def borders_shown(self):
+        """
+        :return: draw_borders, or 0 when the render quality leaves out the borders
+        """
+
+        return self.draw_borders if self.quality < QUALITY_NO_BORDERS else 0
+
+    @property
+    def indexes_shown(self):
+        """
+        :return: draw_indexes, or 0 when the render quality leaves out the indexes
+        """
+
+        return self.draw_indexes if self.quality < QUALITY_NO_INDEXES else 0
+
+    @property
+    def exposure_shown(self):
+        """
+        :return: `bool` True if the exposure of the strip is shown instead of the latest frame
+        """
+
+        return globals.strip_data.exposure.enabled
 
     def on_data_updated(self, sender):
         """
-        Event callback when the strip_data has received updated data
+        Event callback when the strip_data has received updated data.  Paint just the LEDs that changed inside the
+        view, straight to the widget surface, and pass their rects up.  Render the whole view if a large part of it
+        changed, or if it shows aggregated blocks of LEDs.
 
         :param sender: blinker sender
         :return: None
         """
 
-        self.redraw()
+        changed = globals.strip_data.changed_pixels()
+        if self.heatmap or self.exposure_shown:
+            # Every received frame moves the window the activity is counted over, and fades the exposure of every
+            # LED, changed or not
+            self.led_layer_stale = True
+            self.redraw()
+            return
+        if not len(changed):
+            return
+
+        if self._dirty or self.surface is None or self.block > 1:
+            self.led_layer_stale = True
+            self.redraw()
+            return
+
+        # LEDs outside of the view are not drawn
+        mapping_data = globals.mapping_data
+        xs = mapping_data.pixel_x[changed] - int(self.view_start.x)
+        ys = mapping_data.pixel_y[changed] - int(self.view_start.y)
+        changed = changed[(xs >= 0) & (xs < self.visible_size.x) & (ys >= 0) & (ys < self.visible_size.y)]
+        if not len(changed):
+            return
+
+        if len(changed) > self.full_repaint * self.visible_size.x * self.visible_size.y:
+            self.led_layer_stale = True
+            self.redraw()
+            return
+
+        positions = mapping_data.positions
+        offset = self.layout.global_rect.topleft
+
+        rects = []
+        for index, color in zip(changed.tolist(), self.led_colors(changed).tolist()):
+            x, y = positions[index]
+            self.render_led(x, y, color)
+            rects.append(self.led_rect(x, y).move(offset))
+
+        # Only tell the parent, this widget does not need to render again.  Many scattered LEDs are passed up as
+        # one rect around all of them, leaving the scene room for the rest of the gui.
+        if self._redraw_callback:
+            if len(rects) > self.max_dirty_rects // 2:
+                rects = [rects[0].unionall(rects)]
+            for rect in rects:
+                self._redraw_callback(rect)
 
     def on_drawborders(self, sender, draw_borders):
         """
@@ -77,8 +197,14 @@ class DotGridWidget(Widget):
         :return: None
         """
 
+        old_borders = self.borders_shown
         self.draw_borders = draw_borders
-        self.initialize_grid()
+        if (old_borders > 0) == (self.borders_shown > 0):
+            # Only the color of the background layer changes, the grid stays the same
+            self.create_background_layer()
+        else:
+            # Borders turned on or off, which changes the size of every LED
+            self.initialize_grid()
         self.redraw()
 
     def on_drawindexs(self, sender, draw_indexes):
@@ -90,9 +216,187 @@ class DotGridWidget(Widget):
         :return: None
         """
 
+        # Only the color of the index layer changes, the grid stays the same
         self.draw_indexes = draw_indexes
+        self.index_layer = None
+        self.redraw()
+
+    def on_quality(self, sender, level):
+        """
+        Event callback of the QualityGovernor.  Every level changes the grid, or what is drawn over it.
+
+        :param sender: blinker signal sender
+        :param level: `int` render quality level
+        :return: None
+        """
+
+        self.quality = level
+        self.change_view()
+
+    def on_mousebuttondown(self, sender, event):
+        """
+        Callback for the app/pygame mousebuttondown event.  The mouse wheel zooms in and out around the cursor.
+
+        :param sender: blinker sender
+        :param event: pygame Event
+        :return: None
+        """
+
+        if event.button not in (4, 5):
+            return
+
+        global_rect = self.layout.global_rect
+        if global_rect.collidepoint(event.pos):
+            factor = self.zoom_step if event.button == 4 else 1.0 / self.zoom_step
+            self.zoom_at(factor, Vector2(event.pos) - Vector2(global_rect.topleft))
+
+    def on_mousemotion(self, sender, event):
+        """
+        Callback for the app/pygame mousemotion event.  Dragging with the middle or right mouse button pans the view.
+
+        :param sender: blinker sender
+        :param event: pygame Event
+        :return: None
+        """
+
+        if (event.buttons[1] or event.buttons[2]) and self.layout.global_rect.collidepoint(event.pos):
+            self.pan(-event.rel[0], -event.rel[1])
+
+    def on_keydown(self, sender, event):
+        """
+        pygame event KEYDOWN event call back.  The + and - keys zoom in and out around the middle of the view, 0
+        shows the whole grid again.  G toggles the global brightness, H the activity heatmap, E the exposure.
+
+        :param sender: blinker sender
+        :param event: pygame Event
+        :return: None
+        """
+
+        center = Vector2(self.layout.size) / 2
+        if event.key in (pygame.K_EQUALS, pygame.K_PLUS, pygame.K_KP_PLUS):
+            self.zoom_at(self.zoom_step, center)
+        elif event.key in (pygame.K_MINUS, pygame.K_KP_MINUS):
+            self.zoom_at(1.0 / self.zoom_step, center)
+        elif event.key in (pygame.K_0, pygame.K_KP0) and (self.zoom != 1.0 or self.view != Vector2(0, 0)):
+            self.zoom = 1.0
+            self.view = Vector2(0, 0)
+            self.change_view()
+        elif event.key == pygame.K_g:
+            self.global_brightness = not self.global_brightness
+            # The exposure accumulates the light the same way, and starts again from the next frame
+            exposure = globals.strip_data.exposure
+            exposure.global_brightness = self.global_brightness
+            exposure.enable(exposure.enabled)
+            self.led_layer_stale = True
+            self.redraw()
+        elif event.key == pygame.K_h and globals.strip_data.activity is not None:
+            self.heatmap = not self.heatmap
+            self.led_layer_stale = True
+            self.redraw()
+        elif event.key == pygame.K_e:
+            globals.strip_data.exposure.enable(not self.exposure_shown)
+            self.led_layer_stale = True
+            self.redraw()
+
+    def max_zoom(self):
+        """
+        :return: `float` highest zoom, where DOT_GRID_MIN_VISIBLE LEDs still fit across the widget
+        """
+
+        max_size = self.max_grid_pixel_size()
+        fit = min(self.fit_cell_size.x, self.fit_cell_size.y)
+        return max(1.0, min(max_size.x, max_size.y) / float(self.min_visible) / fit)
+
+    def zoom_at(self, factor, pos):
+        """
+        Zoom the view, keeping the LED under pos in the same place.
+
+        :param factor: `float` multiplied with the current zoom
+        :param pos: (x, y) pixel position relative to this widget
+        :return: None
+        """
+
+        zoom = min(max(self.zoom * factor, 1.0), self.max_zoom())
+        if zoom == self.zoom:
+            return
+
+        # LED under pos, as a fraction of a column and row
+        offset = Vector2(pos) - self.grid_position
+        led_x = self.view_start.x * self.block + offset.x * self.block / self.cell_size.x
+        led_y = self.view_start.y * self.block + offset.y * self.block / self.cell_size.y
+
+        self.zoom = zoom
+        self.calculate_cell_size(self.max_grid_pixel_size())
+        self.view = Vector2(led_x - offset.x * self.block / self.cell_size.x,
+                            led_y - offset.y * self.block / self.cell_size.y)
+        self.initialize_grid()
+
+        # The grid moves once it is larger than the widget, correct the view for its new position
+        offset = Vector2(pos) - self.grid_position
+        self.view = Vector2(led_x - offset.x * self.block / self.cell_size.x,
+                            led_y - offset.y * self.block / self.cell_size.y)
+        self.change_view()
+
+    def pan(self, dx, dy):
+        """
+        Move the view by a number of pixels.  The LEDs are only gathered again once the view moved by a whole grid
+        cell.
+
+        :param dx: pixels to move right
+        :param dy: pixels to move down
+        :return: None
+        """
+
+        view_start = self.view_start
+        self.view += Vector2(dx * self.block / self.cell_size.x, dy * self.block / self.cell_size.y)
+        self.calculate_view(self.max_grid_pixel_size())
+        if self.view_start != view_start:
+            self.move_view()
+
+    def scroll_to(self, x, y):
+        """
+        Pan the view to center on an LED, if it is not already in view.
+
+        :param x: grid column
+        :param y: grid row
+        :return: None
+        """
+
+        if self.in_view(x, y):
+            return
+        self.view = Vector2(x - self.visible_size.x * self.block / 2.0, y - self.visible_size.y * self.block / 2.0)
+        self.calculate_view(self.max_grid_pixel_size())
+        self.move_view()
+
+    def change_view(self):
+        """
+        The view was zoomed or panned, rebuild the grid for it and tell the entities drawn over the grid.
+        Trigger Blinker Event "dotgrid.view.changed"
+
+        :return: None
+        """
+
         self.initialize_grid()
         self.redraw()
+        self.view_changed.send(self)
+
+    def move_view(self):
+        """
+        The view was panned, without changing the size of the grid cells or how many fit in the widget.  The layers
+        keep their size and only the LEDs are gathered again.  The background cuts out the mapped LEDs, it is only
+        rebuilt when some cells are not mapped.
+        Trigger Blinker Event "dotgrid.view.changed"
+
+        :return: None
+        """
+
+        if globals.mapping_data.unmapped and self.block == 1:
+            self.create_background_layer()
+        self.led_layer_stale = True
+        # The labels are those of the LEDs inside the view
+        self.index_layer = None
+        self.redraw()
+        self.view_changed.send(self)
 
     def on_fit(self):
         """
@@ -102,6 +406,7 @@ class DotGridWidget(Widget):
         """
 
         self.initialize_grid()
+        log.info("LED size calculated %s, with borders %s", self.led_size, self.cell_size)
 
     def max_grid_pixel_size(self):
         """
@@ -122,18 +427,14 @@ class DotGridWidget(Widget):
         """
 
         # Initial background Size
-        background_size_px = Vector2(self.grid_size.x * self.cell_size.x,
-                                     self.grid_size.y * self.cell_size.y)
+        background_size_px = Vector2(self.visible_size.x * self.cell_size.x,
+                                     self.visible_size.y * self.cell_size.y)
         # add in perimeter border size
 
         background_size_px.x += (self.perimeter_border_size.x * 2)
         background_size_px.y += (self.perimeter_border_size.y * 2)
 
-        self.grid_background_surface = pygame.Surface(vector2_to_int(background_size_px))
-
-        if self.draw_borders > 0:
-            color = config.get("DRAW_BORDERS_COLORS")[self.draw_borders - 1]
-            self.grid_background_surface.fill(color)
+        self.grid_background_surface = pygame.Surface(vector2_to_int(background_size_px), pygame.SRCALPHA)
 
         grid_background_position_rect = self.grid_background_surface.get_rect()
         grid_background_position_rect.centerx = self.layout.size.x / 2
@@ -141,10 +442,185 @@ class DotGridWidget(Widget):
 
         # Center the grid background in its space
         self.grid_background_position = Vector2(grid_background_position_rect.topleft)
+        self.grid_position = self.grid_background_position + self.perimeter_border_size
+
+    def led_mask(self):
+        """
+        Find the pixels of the background layer that are covered by a mapped LED.
+
+        :return: numpy bool array the size of the background layer, indexed [x][y]
+        """
+
+        width, height = self.grid_background_surface.get_size()
+        columns, rows = int(self.visible_size.x), int(self.visible_size.y)
+        cell_x, cell_y = int(self.cell_size.x), int(self.cell_size.y)
+        border_x, border_y = int(self.border_size.x), int(self.border_size.y)
+
+        # Pixel positions relative to the first grid cell
+        xs = numpy.arange(width) - int(self.perimeter_border_size.x)
+        ys = numpy.arange(height) - int(self.perimeter_border_size.y)
+
+        # Columns and rows of pixels that are inside an LED, and not in a border
+        led_x = (xs >= 0) & (xs < columns * cell_x) & (xs % cell_x >= border_x) & (xs % cell_x < cell_x - border_x)
+        led_y = (ys >= 0) & (ys < rows * cell_y) & (ys % cell_y >= border_y) & (ys % cell_y < cell_y - border_y)
+
+        if self.block > 1:
+            # An aggregated block shows the mean or max of the LEDs in it, mapped or not
+            mapped = numpy.ones((columns, rows), dtype=bool)
+        else:
+            mapped = self.visible_cell_index() >= 0
+        cells = mapped[numpy.clip(xs // cell_x, 0, columns - 1)[:, None],
+                       numpy.clip(ys // cell_y, 0, rows - 1)[None, :]]
+
+        return led_x[:, None] & led_y[None, :] & cells
+
+    def create_background_layer(self):
+        """
+        Fill the background layer with the border color, and cut out the mapped LEDs so the LED layer shows through.
+        Unmapped cells keep the border color.
+
+        :return: None
+        """
+
+        color = config.get("DRAW_BORDERS_COLORS")[self.borders_shown - 1]
+        self.grid_background_surface.fill(color)
+
+        alpha = pygame.surfarray.pixels_alpha(self.grid_background_surface)
+        alpha[self.led_mask()] = 0
+        # Release the surface lock held by the pixel array
+        del alpha
+
+    def create_led_layer(self):
+        """
+        Create the LED layer of the view, each LED color fills its whole grid cell.  The borders are drawn over it
+        by the background layer.
+
+        :return: None
+        """
+
+        columns, rows = int(self.visible_size.x), int(self.visible_size.y)
+        self._led_pixels = pygame.Surface((columns, rows))
+        self.led_layer = pygame.Surface((int(columns * self.cell_size.x), int(rows * self.cell_size.y)))
+        self.led_layer_stale = True
+
+    def visible_cell_index(self):
+        """
+        :return: numpy array of the pixel index of each LED inside the view, indexed [x][y], -1 if not mapped
+        """
+
+        x = int(self.view_start.x) * self.block
+        y = int(self.view_start.y) * self.block
+        return globals.mapping_data.cell_index[x:x + int(self.visible_size.x) * self.block,
+                                               y:y + int(self.visible_size.y) * self.block]
+
+    @staticmethod
+    def aggregate_blocks(array, block, aggregate):
+        """
+        Aggregate square blocks of an array indexed [x][y][channel], by the mean or max of each channel.  Each axis
+        is reduced with one vectorized operation per row or column of a block, on every block at once.  The last
+        block of an axis may be cut short by the edge of the array.
+
+        :param array: numpy uint8 array indexed [x][y][channel]
+        :param block: `int` columns and rows of each block
+        :param aggregate: `str` "mean" or "max"
+        :return: numpy uint8 array with one element per block
+        """
+
+        if aggregate == "max":
+            op, dtype = numpy.maximum, numpy.uint8
+        else:
+            op, dtype = numpy.add, numpy.uint16 if 255 * block * block <= 0xFFFF else numpy.uint32
+
+        reduced = array
+        for axis in (0, 1):
+            result = None
+            for i in range(block):
+                part = reduced[i::block] if axis == 0 else reduced[:, i::block]
+                if result is None:
+                    result = part.astype(dtype)
+                else:
+                    into = result[:len(part)] if axis == 0 else result[:, :part.shape[1]]
+                    op(into, part, out=into)
+            reduced = result
+
+        if aggregate == "max":
+            return reduced
+
+        # Divide by the number of elements in each block
+        counts_x = numpy.minimum(array.shape[0] - numpy.arange(0, array.shape[0], block), block)
+        counts_y = numpy.minimum(array.shape[1] - numpy.arange(0, array.shape[1], block), block)
+        return (reduced // numpy.outer(counts_x, counts_y)[:, :, None].astype(dtype)).astype(numpy.uint8)
+
+    def visible_colors(self):
+        """
+        Gather the displayed colors of the LEDs inside the view, one per grid cell, scaled by their global
+        brightness.  Blocks of LEDs are aggregated to their mean or max color, in the light the LEDs give off,
+        before the gamma is applied.  The exposure is gathered the same way when shown, its light is already scaled
+        by the global brightness.  The activity heatmap is laid over the colors when shown.
+
+        :return: numpy uint8 array of (r, g, b), indexed [x][y]
+        """
+
+        cell_index = self.visible_cell_index()
+        if self.exposure_shown:
+            rgb = globals.strip_data.exposure.colors(cell_index)
+            if globals.mapping_data.unmapped:
+                rgb[cell_index < 0] = 0
+            if self.block > 1:
+                rgb = self.aggregate_blocks(rgb, self.block, self.aggregate)
+        else:
+            pixels = globals.strip_data.pixel_words()
+            colors = pixels.take(cell_index)
+            channels = colors.view(numpy.uint8).reshape(cell_index.shape + (4, ))
+            if self.global_brightness:
+                apply_brightness(channels)
+            if globals.mapping_data.unmapped:
+                colors[cell_index < 0] = 0
+            if self.block > 1:
+                channels = self.aggregate_blocks(channels, self.block, self.aggregate)
+            # The red, green and blue bytes of each pixel
+            rgb = channels[:, :, self._rgb_selector]
+        # The displayed value of each color
+        if self.gamma_lut is not None:
+            rgb = self.gamma_lut.take(rgb)
+        if self.heatmap:
+            rgb = self.overlay_heatmap(rgb, cell_index)
+        return rgb
+
+    def overlay_heatmap(self, rgb, cell_index):
+        """
+        Lay the activity of each grid cell over its color, a quarter of the color under three quarters of the heat.
+        Blocks of LEDs show the mean or max activity of the LEDs in them.
+
+        :param rgb: numpy uint8 array of (r, g, b), one per grid cell, indexed [x][y]
+        :param cell_index: numpy array of the pixel index of each LED inside the view, from visible_cell_index
+        :return: numpy uint8 array of (r, g, b), indexed [x][y]
+        """
+
+        levels = globals.strip_data.activity.levels(cell_index)
+        if globals.mapping_data.unmapped:
+            levels[cell_index < 0] = 0
+        if self.block > 1:
+            levels = self.aggregate_blocks(levels[:, :, None], self.block, self.aggregate)[:, :, 0]
+        heat = HEAT_LUT.take(levels, axis=0)
+        return (rgb >> 2) + (heat - (heat >> 2))
+
+    def update_led_layer(self):
+        """
+        Update the LED layer from the displayed strip_data.  The colors inside the view are gathered into one pixel
+        per grid cell with numpy, which is then scaled up to the size of the view.
+
+        :return: None
+        """
+
+        pygame.surfarray.blit_array(self._led_pixels, self.visible_colors())
+        pygame.transform.scale(self._led_pixels, self.led_layer.get_size(), self.led_layer)
+        self.led_layer_stale = False
 
     def calculate_cell_size(self, max_grid_pixel_size):
         """
-        Given the max grid pixel size, determine the size of the individual grid cells.
+        Given the max grid pixel size and the zoom, determine the size of the individual grid cells.  If an LED is
+        smaller than a pixel, each grid cell holds a block of LEDs instead.
 
         :param max_grid_pixel_size: pygame.math.Vector2 of the max size of the whole grid.
         :return: None
@@ -153,12 +629,6 @@ class DotGridWidget(Widget):
         width = max_grid_pixel_size.x / float(self.grid_size.x)
         height = max_grid_pixel_size.y / float(self.grid_size.y)
 
-        # Check that the LED size is at least 1px
-        if width <= 1.0 or height <= 1.0:
-            log.error("Calculated LED cell size less than 1 pixel.  The WINDOW_SIZE is to small to fit "
-                      "the configured GRID_SIZE")
-            raise Exception("LED size less than 1 pixel")
-
         # Sqaure up the LED
         if config.get("SQUARE_LED"):
             if width < height:
@@ -166,7 +636,16 @@ class DotGridWidget(Widget):
             else:
                 width = height
 
-        self.cell_size = vector2_to_floor(Vector2(width, height))
+        self.fit_cell_size = Vector2(width, height)
+        width *= self.zoom
+        height *= self.zoom
+
+        # Number of LEDs across a block so it is at least 1px
+        self.block = max(1, int(math.ceil(1.0 / min(width, height))))
+        if self.quality >= QUALITY_AGGREGATED:
+            # Half the resolution, each grid cell holds a block twice as large
+            self.block *= 2
+        self.cell_size = Vector2(max(1, int(width * self.block)), max(1, int(height * self.block)))
 
     def calculate_led_size(self):
         """
@@ -175,7 +654,8 @@ class DotGridWidget(Widget):
         :return: None
         """
 
-        if self.draw_borders:
+        # Aggregated blocks of LEDs are drawn without borders
+        if self.borders_shown and self.block == 1:
             self.border_size = Vector2(config.get("BORDER_SIZE"))
         else:
             self.border_size = Vector2(0, 0)
@@ -183,15 +663,29 @@ class DotGridWidget(Widget):
         width = self.cell_size.x - (self.border_size.x * 2)
         height = self.cell_size.y - (self.border_size.y * 2)
 
+        # Leave out the borders of LEDs that are too small to fit them
+        if width <= 1.0 or height <= 1.0:
+            self.border_size = Vector2(0, 0)
+            width, height = self.cell_size.x, self.cell_size.y
+
         self.led_size = vector2_to_floor(Vector2(width, height))
 
-        self.led_surface = pygame.Surface(self.led_size)
+    def calculate_view(self, max_grid_pixel_size):
+        """
+        Determine the grid cells that fit inside the widget, and keep the view from moving past the edge of the grid.
+
+        :param max_grid_pixel_size: pygame.math.Vector2 of the max size of the whole grid.
+        :return: None
+        """
 
-        # Check that the LED size is at least 1px
-        if self.led_size.x <= 1.0 or self.led_size.y <= 1.0:
-            log.error("LED border size is to large for calculated LED size '(%s, %s) pixels'",
-                      self.cell_size.x, self.cell_size.y)
-            raise Exception("LED border size is to large.")
+        columns = int(math.ceil(self.grid_size.x / self.block))
+        rows = int(math.ceil(self.grid_size.y / self.block))
+        self.visible_size = Vector2(max(1, min(columns, int(max_grid_pixel_size.x // self.cell_size.x))),
+                                    max(1, min(rows, int(max_grid_pixel_size.y // self.cell_size.y))))
+
+        self.view = Vector2(min(max(self.view.x, 0), (columns - self.visible_size.x) * self.block),
+                            min(max(self.view.y, 0), (rows - self.visible_size.y) * self.block))
+        self.view_start = Vector2(int(self.view.x // self.block), int(self.view.y // self.block))
 
     def initialize_grid(self):
         """
@@ -202,13 +696,15 @@ class DotGridWidget(Widget):
 
         # Store Grid Size
         self.grid_size = Vector2(config.get("GRID_SIZE"))
-        if self.draw_borders:
+        if self.borders_shown:
             self.perimeter_border_size = Vector2(config.get("PERIMETER_BORDER_SIZE"))
         else:
             self.perimeter_border_size = Vector2(0, 0)
 
         # Calculate cell_size
-        self.calculate_cell_size(self.max_grid_pixel_size())
+        max_grid_pixel_size = self.max_grid_pixel_size()
+        self.calculate_cell_size(max_grid_pixel_size)
+        self.calculate_view(max_grid_pixel_size)
 
         # Create Background
         self.create_background()
@@ -216,67 +712,155 @@ class DotGridWidget(Widget):
         # Calculate LED Size
         self.calculate_led_size()
 
-        log.info("LED size calculated %s, with borders %s", self.led_size, self.cell_size)
-
-        # store led rects, of just the LED rect
-        self.led_rects = [[None for x in range(int(self.grid_size.y))] for y in range(int(self.grid_size.x))]
-        # each grid cells rect, includes led borders
-        self.grid_rects = [[None for x in range(int(self.grid_size.y))] for y in range(int(self.grid_size.x))]
+        # Create the layers
+        self.create_background_layer()
+        self.create_led_layer()
 
-        for x in range(int(self.grid_size.x)):
-            for y in range(int(self.grid_size.y)):
+        # The index positions depend on the grid, rebuild when next drawn
+        self.index_layer = None
 
-                top = self.grid_background_position.y + (self.cell_size.y * y)
-                left = self.grid_background_position.x + (self.cell_size.x * x)
-                top += self.border_size.y
-                left += self.border_size.x
-                top += self.perimeter_border_size.y
-                left += self.perimeter_border_size.x
+    def in_view(self, x, y):
+        """
+        :param x: grid column
+        :param y: grid row
+        :return: `bool` True if the LED is inside the view
+        """
 
-                width = self.cell_size.x - (self.border_size.x * 2)
-                height = self.cell_size.y - (self.border_size.y * 2)
+        x = x // self.block - self.view_start.x
+        y = y // self.block - self.view_start.y
+        return 0 <= x < self.visible_size.x and 0 <= y < self.visible_size.y
 
-                rect = pygame.Rect(left, top, width, height)
-                self.led_rects[x][y] = rect
+    def led_rect(self, x, y):
+        """
+        :param x: grid column
+        :param y: grid row
+        :return: pygame.Rect of just the LED of the grid cell showing the LED, positioned to this widget
+        """
 
-                top = self.grid_background_position.y + (self.cell_size.y * y) + self.perimeter_border_size.y
-                left = self.grid_background_position.x + (self.cell_size.x * x) + self.perimeter_border_size.x
+        return Rect(int(self.grid_position.x + self.cell_size.x * (x // self.block - self.view_start.x) +
+                        self.border_size.x),
+                    int(self.grid_position.y + self.cell_size.y * (y // self.block - self.view_start.y) +
+                        self.border_size.y),
+                    int(self.led_size.x), int(self.led_size.y))
 
-                width = self.cell_size.x
-                height = self.cell_size.y
+    def grid_rect(self, x, y):
+        """
+        :param x: grid column
+        :param y: grid row
+        :return: pygame.Rect of the grid cell showing the LED, including the LED borders, positioned to this widget
+        """
 
-                rect = Rect(left, top, width, height)
-                self.grid_rects[x][y] = rect
+        return Rect(int(self.grid_position.x + self.cell_size.x * (x // self.block - self.view_start.x)),
+                    int(self.grid_position.y + self.cell_size.y * (y // self.block - self.view_start.y)),
+                    int(self.cell_size.x), int(self.cell_size.y))
 
-    def on_render(self):
+    def cell_at(self, pos):
+        """
+        Find the grid cell at a position, with a floor division instead of searching the cells.
 
-        self.surface.fill((0, 0, 0, 0))
+        :param pos: (x, y) pixel position relative to this widget
+        :return: (x, y) grid column and row of the LED, or the first LED of an aggregated block, or None if pos is
+                 not over the grid
+        """
 
-        # if self.draw_borders > 0:
-        self.surface.blit(self.grid_background_surface, self.grid_background_position)
+        x = int((pos[0] - self.grid_position.x) // self.cell_size.x)
+        y = int((pos[1] - self.grid_position.y) // self.cell_size.y)
+        if 0 <= x < self.visible_size.x and 0 <= y < self.visible_size.y:
+            return int(self.view_start.x + x) * self.block, int(self.view_start.y + y) * self.block
+        return None
 
-        bg_color = config.get("DRAW_BORDERS_COLORS")[self.draw_borders - 1]
+    def index_font(self):
+        """
+        :return: pygame font for the pixel index, sized based on the size of the LED
+        """
 
-        # adjust font size for pixel index rendering based on size of the pixel
         if self.led_size.x >= 30 and self.led_size.y >= 30:
-            font = globals.current_app.get_font(18)
+            return globals.current_app.get_font(18)
         else:
-            font = globals.current_app.get_font(8)
-
-        for y in range(int(self.grid_size.y)):
-            for x in range(int(self.grid_size.x)):
-                index = globals.mapping_data.get(x, y)
-                if index is not None:
-                    c, b, g, r = globals.strip_data.get(index)
-                    color = (r, g, b)
-                else:
-                    color = bg_color
-                self.led_surface.fill(color)
-                if index is not None and self.draw_indexes > 0:
-                    text = font.render(str(index), True, self.draw_indexes_colors[self.draw_indexes - 1])
-                    text_pos = text.get_rect()
-                    text_pos.center = self.led_surface.get_rect().center
-                    self.led_surface.blit(text, text_pos)
-                self.surface.blit(self.led_surface, self.led_rects[x][y])
+            return globals.current_app.get_font(8)
+
+    def create_index_layer(self):
+        """
+        Rasterize the index of every LED inside the view, centered on the LED, to a transparent surface the size of
+        the widget.  The digits 0-9 are rendered once and each index is put together from them.  An index that does
+        not fit inside its LED is left out, as are the indexes of aggregated blocks.
+
+        :return: None
+        """
+
+        self.index_layer = pygame.Surface(self.layout.size, pygame.SRCALPHA)
+        self.index_layer.fill((0, 0, 0, 0))
+        if self.block > 1:
+            return
+
+        font = self.index_font()
+        color = self.draw_indexes_colors[self.indexes_shown - 1]
+        digits = [font.render(str(i), True, color) for i in range(10)]
+        digit_width = max(digit.get_width() for digit in digits)
+        digit_height = max(digit.get_height() for digit in digits)
+
+        # Number of digits that fit across an LED
+        max_digits = int(self.led_size.x) // digit_width if digit_height <= self.led_size.y else 0
+        if not max_digits:
+            return
+
+        cell_index = self.visible_cell_index()
+        view_x, view_y = int(self.view_start.x), int(self.view_start.y)
+        for x, y in zip(*numpy.nonzero((cell_index >= 0) & (cell_index < 10 ** max_digits))):
+            text = str(cell_index[x, y])
+            rect = self.led_rect(view_x + x, view_y + y)
+            left = rect.centerx - (len(text) * digit_width) // 2
+            top = rect.centery - digit_height // 2
+            for i, digit in enumerate(text):
+                # Digits never overlap, so take the glyph as is instead of blending it with the transparent layer
+                self.index_layer.blit(digits[int(digit)], (left + i * digit_width, top),
+                                      special_flags=pygame.BLEND_RGBA_MAX)
+
+    def led_colors(self, indexes):
+        """
+        Gather the displayed colors of the given LEDs, through the same lookup tables as visible_colors, in one
+        vectorized pass.
+
+        :param indexes: numpy array of pixel indexes
+        :return: numpy uint8 array of (r, g, b), one per index
+        """
 
+        channels = globals.strip_data.get_many(indexes)
+        if self.global_brightness:
+            apply_brightness(channels)
+        rgb = channels[:, self._rgb_selector]
+        if self.gamma_lut is not None:
+            rgb = self.gamma_lut.take(rgb)
+        return rgb
+
+    def render_led(self, x, y, color):
+        """
+        Paint a single mapped LED, and its index if enabled, to the widget surface.
+
+        :param x: grid column
+        :param y: grid row
+        :param color: (r, g, b) displayed color of the LED, from led_colors
+        :return: None
+        """
+
+        rect = self.led_rect(x, y)
+        self.surface.fill(color, rect)
+        self.led_layer.fill(color, rect.move(-int(self.grid_position.x), -int(self.grid_position.y)))
+        if self.indexes_shown > 0:
+            self.surface.blit(self.index_layer, rect, rect)
+
+    def on_render(self):
+
+        self.surface.fill((0, 0, 0, 0))
+
+        # LED colors, with the background and borders drawn over them
+        if self.led_layer_stale:
+            self.update_led_layer()
+        self.surface.blit(self.led_layer, self.grid_position)
+        self.surface.blit(self.grid_background_surface, self.grid_background_position)
 
+        # The index of every LED in a single blit
+        if self.indexes_shown > 0:
+            if self.index_layer is None:
+                self.create_index_layer()
+            self.surface.blit(self.index_layer, (0, 0))
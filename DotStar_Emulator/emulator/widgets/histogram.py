@@ -0,0 +1,46 @@
+from DotStar_Emulator.emulator.gui import Widget
+
+
+class HistogramWidget(Widget):
+
+    def __init__(self, color, background=(20, 20, 20)):
+        """
+        Bar chart of the counts of a histogram, each bar scaled to the largest count.
+
+        :param color: (r, g, b) color of a bar
+        :param background: (r, g, b) background color
+        :return:
+        """
+
+        super(HistogramWidget, self).__init__(use_surface=True)
+
+        self.color = color
+        self.background = background
+
+        self.counts = None  # count of each bar
+
+    def set(self, counts):
+        """
+        :param counts: sequence of the count of each bar
+        :return: None
+        """
+
+        self.counts = list(counts)
+        self.redraw()
+
+    def on_render(self):
+        self.surface.fill(self.background)
+        if not self.counts:
+            return
+
+        width, height = self.surface.get_size()
+        top = float(max(self.counts)) or 1.0
+
+        bars = len(self.counts)
+        for i, count in enumerate(self.counts):
+            left = width * i // bars
+            right = width * (i + 1) // bars
+            bar = int(round(height * count / top))
+            if bar:
+                # Leave a pixel between bars, when there is room
+                self.surface.fill(self.color, (left, height - bar, max(1, right - left - 1), bar))
@@ -0,0 +1,170 @@
+from DotStar_Emulator.emulator import config
+from DotStar_Emulator.emulator import globals
+from DotStar_Emulator.emulator.gui import TwoColumns, SizedRows
+from .running_info import RunningInfo
+
+
+class PerformanceInfo(TwoColumns):
+    def __init__(self):
+        """
+        Widget to show where the time of the main loop and packet ingest is spent.  Shares the running screens info
+        space with RunningInfo, rows line up so the RunningFPS entity draws in the same place on both.
+
+        :return:
+        """
+        super(PerformanceInfo, self).__init__(x=145)
+        # No bottom margin, like RunningInfo, leaves room for the frame validation rows
+        self.layout.margin.set(0, 5, 0, 5)
+
+        self.update_rate = config.get("PERFORMANCE_UPDATE_RATE")
+        self.elapsed = 0
+
+        self.stage_txt = {}  # main loop stage name: value TextLabelWidget
+        self.ingest_txt = {}  # data reader stage name: value TextLabelWidget
+        self.arrival_txt = {}  # packet arrival statistic name: value TextLabelWidget
+        self.display_txt = {}  # ingest and display rate name: value TextLabelWidget
+
+        # strip_data counters at the last refresh, the rates are calculated from the change since
+        self.frame_count = 0
+        self.frames_displayed = 0
+        self.frames_not_displayed = 0
+
+        row_size = 14
+        self.left = SizedRows(row_size)
+        self.right = SizedRows(row_size)
+        self.set_left(self.left)
+        self.set_right(self.right)
+
+        self.left.set(RunningInfo.hd_txt("Performance"), 0)
+
+        i = 1
+        self.left.set(RunningInfo.lbl_text("Emulator FPS:"), i)
+
+        i += 2
+        self.left.set(RunningInfo.hd_txt("Main Loop, avg / p99"), i)
+        for stage, label in (("events", "Events:"), ("update", "Update:"), ("strip_update", "Strip Update:"),
+                             ("draw", "Draw:"), ("flip", "Flip:"), ("total", "Total:")):
+            i += 1
+            self.add_row(label, stage, self.stage_txt, i)
+
+        i += 2
+        self.left.set(RunningInfo.hd_txt("Packet Ingest, avg / p99"), i)
+        for stage, label in (("recv", "Receive:"), ("copy", "Copy:")):
+            i += 1
+            self.add_row(label, stage, self.ingest_txt, i)
+
+        i += 2
+        self.left.set(RunningInfo.hd_txt("Packet Arrival"), i)
+        for name, label in (("interval", "Interval p50/p99:"), ("jitter", "Jitter:"), ("gaps", "Gaps:"),
+                            ("last", "Last Packet:")):
+            i += 1
+            self.add_row(label, name, self.arrival_txt, i)
+
+        i += 2
+        self.left.set(RunningInfo.hd_txt("Ingest / Display"), i)
+        for name, label in (("ingest", "Ingest Rate:"), ("display", "Display Rate:"),
+                            ("not_displayed", "Not Displayed:"), ("malformed", "Malformed:"),
+                            ("length", "Length / End:")):
+            i += 1
+            self.add_row(label, name, self.display_txt, i)
+
+    def add_row(self, label, stage, texts, i):
+        """
+        Add a labeled timing value row.
+
+        :param label: `str` label text
+        :param stage: `str` name of the timed stage
+        :param texts: `dict` to store the value TextLabelWidget in
+        :param i: row index
+        :return: None
+        """
+
+        self.left.set(RunningInfo.lbl_text(label), i)
+        texts[stage] = RunningInfo.val_text("")
+        self.right.set(texts[stage], i)
+
+    @staticmethod
+    def timing_text(ring_buffer):
+        """
+        :param ring_buffer: stats.RingBuffer of seconds
+        :return: `str` average and p99 in milliseconds
+        """
+
+        mean = ring_buffer.mean()
+        if mean is None:
+            return "-"
+        return "{:.2f} / {:.2f} ms".format(mean * 1000.0, ring_buffer.percentile(99) * 1000.0)
+
+    def update(self, elapsed):
+        """
+        Refresh the timing values at PERFORMANCE_UPDATE_RATE.
+
+        :param elapsed: milliseconds og pygame clock since last call
+        :return: None
+        """
+
+        super(PerformanceInfo, self).update(elapsed)
+
+        self.elapsed += elapsed
+        if self.elapsed < self.update_rate:
+            return
+        seconds = self.elapsed / 1000.0
+        self.elapsed = 0
+
+        self.update_display(seconds)
+
+        app = globals.current_app
+        for stage, text in self.stage_txt.items():
+            text.text = self.timing_text(app.timings[stage])
+        for stage, text in self.ingest_txt.items():
+            text.text = self.timing_text(app.data_reader.timings[stage])
+
+        arrivals = globals.strip_data.arrivals
+        jitter = arrivals.jitter()
+        if jitter:
+            self.arrival_txt["interval"].text = "{:.2f} / {:.2f} ms".format(jitter["p50"] * 1000.0,
+                                                                            jitter["p99"] * 1000.0)
+            self.arrival_txt["jitter"].text = "{:.2f} ms".format(jitter["jitter"] * 1000.0)
+            self.arrival_txt["gaps"].text = "{}".format(jitter["gaps"])
+        else:
+            for name in ("interval", "jitter", "gaps"):
+                self.arrival_txt[name].text = "-"
+
+        since_last = arrivals.since_last()
+        if since_last is None:
+            self.arrival_txt["last"].text = "-"
+        else:
+            self.arrival_txt["last"].text = "{:.0f} ms ago{}".format(since_last * 1000.0,
+                                                                    ", stalled" if arrivals.stalled() else "")
+
+    def update_display(self, seconds):
+        """
+        Refresh the ingest and display rates, the count of received frames that were never displayed, and the
+        counts of frames that failed validation.
+
+        :param seconds: `float` seconds since the last refresh
+        :return: None
+        """
+
+        strip_data = globals.strip_data
+        frame_count = strip_data.frame_count
+        frames_displayed = strip_data.frames_displayed
+        not_displayed = strip_data.frames_not_displayed
+
+        self.display_txt["ingest"].text = "{:.1f} frames/s".format((frame_count - self.frame_count) / seconds)
+        self.display_txt["display"].text = "{:.1f} frames/s".format(
+            (frames_displayed - self.frames_displayed) / seconds)
+        self.display_txt["not_displayed"].text = "{} (+{})".format(not_displayed,
+                                                                   not_displayed - self.frames_not_displayed)
+
+        if strip_data.validate:
+            self.display_txt["malformed"].text = "{}".format(strip_data.malformed_frames)
+            self.display_txt["length"].text = "{} / {}".format(strip_data.wrong_length_frames,
+                                                               strip_data.short_end_frames)
+        else:
+            self.display_txt["malformed"].text = "off"
+            self.display_txt["length"].text = "off"
+
+        self.frame_count = frame_count
+        self.frames_displayed = frames_displayed
+        self.frames_not_displayed = not_displayed
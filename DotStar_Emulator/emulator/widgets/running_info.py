@@ -5,6 +5,12 @@ from DotStar_Emulator.emulator import config
 from DotStar_Emulator.emulator import globals
 from DotStar_Emulator.emulator.gui import TwoColumns, SizedRows, TextLabelWidget
 from .color_value import ColorValueWidget
+from .sparkline import SparklineWidget
+from .histogram import HistogramWidget
+
+# Color of a value, and of the power draw while over POWER_BUDGET_MA
+VALUE_COLOR = (255, 255, 255)
+OVER_BUDGET_COLOR = (255, 0, 0)
 
 
 class RunningInfo(TwoColumns):
@@ -15,7 +21,8 @@ class RunningInfo(TwoColumns):
         :return:
         """
         super(RunningInfo, self).__init__(x=145)
-        self.layout.margin.set(0, 5, 10, 5)
+        # No bottom margin, leaves room for the quality row above the LED information
+        self.layout.margin.set(0, 5, 0, 5)
 
         # LED information widgets
         self.led_grid_position_txt = []  # value of grid position
@@ -53,30 +60,181 @@ class RunningInfo(TwoColumns):
         self.packet_length_txt = self.val_text("")
         right.set(self.packet_length_txt, i)
 
+        # Rate and timing values, each with a sparkline of the last few seconds next to it
         i += 1
         left.set(self.lbl_text("Packet Rate:"), i)
         self.packet_rate = self.val_text("")
-        right.set(self.packet_rate, i)
+        self.interval_sparkline = SparklineWidget((33, 150, 214), stall_color=(255, 0, 0))
+        right.set(self.sparkline_panel(self.packet_rate, self.interval_sparkline), i)
+
+        i += 1
+        left.set(self.lbl_text("Render Time:"), i)
+        self.render_time_txt = self.val_text("")
+        self.render_sparkline = SparklineWidget((255, 240, 87))
+        right.set(self.sparkline_panel(self.render_time_txt, self.render_sparkline), i)
 
-        i += 2
-        self.pixel_info_count = 4
+        self.sparkline_update_rate = config.get("SPARKLINE_UPDATE_RATE")
+        self.sparkline_elapsed = 0
+        self.arrivals_count = 0  # strip_data.arrivals count at the last sparkline update
+        self.last_arrival = None  # last arrival time seen by the sparkline update
+        self.draw_count = 0  # current_app.timings["draw"] count at the last sparkline update
+
+        i += 1
+        left.set(self.lbl_text("Quality:"), i)
+        governor = globals.current_app.governor
+        self.quality_txt = self.val_text(governor.name if governor.enabled else "{} (fixed)".format(governor.name))
+        right.set(self.quality_txt, i)
+
+        # Frame analytics, shown only when enabled
+        self.analytics_count = 0  # analytics.frames_analyzed at the last refresh
+        if globals.current_app.analytics:
+            i += 1
+            left.set(self.lbl_text("Power Draw:"), i)
+            self.power_txt = self.val_text("-")
+            right.set(self.power_txt, i)
+
+            i += 1
+            left.set(self.lbl_text("Avg / Peak:"), i)
+            self.power_stats_txt = self.val_text("-")
+            right.set(self.power_stats_txt, i)
+
+            i += 1
+            left.set(self.lbl_text("Brightness:"), i)
+            self.brightness_histogram = HistogramWidget((33, 150, 214))
+            self.brightness_histogram.layout.margin.set(2, 0, 2, 0)
+            right.set(self.brightness_histogram, i)
+
+        # Room for one LED less with the analytics rows
+        i += 1
+        self.pixel_info_count = 3 if globals.current_app.analytics else 4
         self.create_pixel_info(left, right, i)
 
         blinker.signal("dotgrid.select.set").connect(self.on_dotgrid_select_set)
         blinker.signal("stripdata.updated").connect(self.on_data_updated)
-        blinker.signal("ratecounter.updated").connect(self.on_ratecounter_updated)
+        blinker.signal("quality.level").connect(self.on_quality)
 
-    def on_ratecounter_updated(self, sender, count):
+        self.rate_update_rate = config.get("PACKET_RATE_UPDATE_RATE")
+        self.rate_elapsed = 0
+
+    def on_quality(self, sender, level):
         """
-        Event callback when the rate_counter updates the frequency count
+        Event callback of the QualityGovernor, show the new render quality level.
+
+        :param sender: QualityGovernor
+        :param level: `int` render quality level
+        :return: None
+        """
+
+        self.quality_txt.text = sender.name
+
+    @staticmethod
+    def sparkline_panel(text, sparkline):
+        """
+        Panel with a value text on the left and its sparkline on the right.
+
+        :param text: TextLabelWidget
+        :param sparkline: SparklineWidget
+        :return: gui Panel
+        """
+
+        panel = TwoColumns(-64)
+        panel.set_left(text)
+        sparkline.layout.margin.set(2, 0, 2, 0)
+        panel.set_right(sparkline)
+        return panel
+
+    def update_sparklines(self):
+        """
+        Push a column to each sparkline, the range of the packet intervals and render times since the last push.
 
-        :param sender: blinker sender
-        :param count: current frequency count in Hz
         :return: None
         """
 
-        self.packet_rate.text = "{} Hz".format(count)
-        self.redraw()
+        arrivals = globals.strip_data.arrivals
+        times, self.arrivals_count = arrivals.arrivals.since(self.arrivals_count)
+        if self.last_arrival is not None:
+            times.insert(0, self.last_arrival)
+        if times:
+            self.last_arrival = times[-1]
+
+        intervals = [b - a for a, b in zip(times, times[1:])]
+        if intervals:
+            self.interval_sparkline.push(min(intervals), max(intervals))
+        elif self.last_arrival is not None:
+            # Nothing arrived, the interval so far is still growing
+            since_last = arrivals.since_last()
+            self.interval_sparkline.push(since_last, since_last, stalled=arrivals.stalled())
+        else:
+            self.interval_sparkline.push(0, 0)
+
+        draws, self.draw_count = globals.current_app.timings["draw"].since(self.draw_count)
+        if draws:
+            self.render_sparkline.push(min(draws), max(draws))
+            self.render_time_txt.text = "{:.2f} ms".format(sum(draws) / len(draws) * 1000.0)
+
+    def update(self, elapsed):
+        """
+        Refresh the packet rate at PACKET_RATE_UPDATE_RATE, it is calculated from strip_data's packet arrival times.
+        Push the sparklines at SPARKLINE_UPDATE_RATE.
+
+        :param elapsed: milliseconds og pygame clock since last call
+        :return: None
+        """
+
+        super(RunningInfo, self).update(elapsed)
+
+        self.sparkline_elapsed += elapsed
+        if self.sparkline_elapsed >= self.sparkline_update_rate:
+            self.sparkline_elapsed = 0
+            self.update_sparklines()
+
+        self.rate_elapsed += elapsed
+        if self.rate_elapsed < self.rate_update_rate:
+            return
+        self.rate_elapsed = 0
+
+        arrivals = globals.strip_data.arrivals
+        if arrivals.stalled():
+            text = "Stalled {:.1f} s".format(arrivals.since_last())
+        else:
+            text = "{:.1f} Hz".format(arrivals.rate())
+        if text != self.packet_rate.text:
+            self.packet_rate.text = text
+
+        self.update_analytics()
+
+    @staticmethod
+    def power_text(ma):
+        """
+        :param ma: `float` milliamps
+        :return: `str` in mA, or A from 1 A up
+        """
+
+        if ma < 1000:
+            return "{:.0f} mA".format(ma)
+        return "{:.2f} A".format(ma / 1000.0)
+
+    def update_analytics(self):
+        """
+        Refresh the power draw and brightness histogram, when a frame was analyzed since the last refresh.  The
+        power draw is shown in red while over POWER_BUDGET_MA.
+
+        :return: None
+        """
+
+        analytics = globals.current_app.analytics
+        if not analytics or analytics.frames_analyzed == self.analytics_count:
+            return
+        self.analytics_count = analytics.frames_analyzed
+
+        color = OVER_BUDGET_COLOR if analytics.over_budget else VALUE_COLOR
+        if color != self.power_txt.color:
+            self.power_txt.color = color
+            self.power_txt.redraw()
+        self.power_txt.text = self.power_text(analytics.last_ma)
+        self.power_stats_txt.text = "{} / {}".format(self.power_text(analytics.power.mean()),
+                                                     self.power_text(analytics.peak_ma))
+        self.brightness_histogram.set(analytics.histogram.tolist())
 
     def on_data_updated(self, sender):
         """
@@ -86,7 +244,11 @@ class RunningInfo(TwoColumns):
         :return: None
         """
         try:
-            self.packet_updated_txt.text = globals.strip_data.updated.strftime("%H:%M:%S.%f")
+            offset = globals.strip_data.history_offset()
+            if offset is None:
+                self.packet_updated_txt.text = globals.strip_data.updated.strftime("%H:%M:%S.%f")
+            else:
+                self.packet_updated_txt.text = "Paused {} frames".format(offset[0])
 
             packet_length = "{} bytes".format(globals.strip_data.packet_length)
             self.packet_length_txt.text = packet_length
@@ -97,14 +259,12 @@ class RunningInfo(TwoColumns):
 
             try:
                 index = int(self.led_strip_index_txt[i].text)
-                c, b, g, r = globals.strip_data.get(index)
+                r, g, b = globals.strip_data.get_rgb(index)
                 self.led_value_txt[i].text = "({}, {}, {})".format(r, g, b)
                 self.led_color[i].color = (r, g, b, 0)
             except ValueError:
                 continue
 
-        self.redraw()
-
     @staticmethod
     def hd_txt(text):
         """
@@ -136,7 +296,7 @@ class RunningInfo(TwoColumns):
         :return: gui.text.TextLabelWidget
         """
 
-        return TextLabelWidget(text, 13, (255, 255, 255))
+        return TextLabelWidget(text, 13, VALUE_COLOR)
 
     def create_pixel_info(self, left, right, offset):
 
@@ -182,7 +342,7 @@ class RunningInfo(TwoColumns):
             self.led_color[i].color = self.led_color[i - 1].color
 
         index = globals.mapping_data.data[x][y]
-        c, b, g, r = globals.strip_data.get(index)
+        r, g, b = globals.strip_data.get_rgb(index)
 
         self.led_grid_position_txt[0].text = "({}, {})".format(x, y)
         self.led_strip_index_txt[0].text = "{}".format(index)
@@ -0,0 +1,88 @@
+from DotStar_Emulator.emulator.gui import Widget
+from DotStar_Emulator.emulator.stats import RingBuffer
+
+
+class SparklineWidget(Widget):
+
+    def __init__(self, color, stall_color=None, background=(20, 20, 20)):
+        """
+        Scrolling sparkline of a timing.  Each column is the low to high range of the values seen during one
+        update, so pacing problems such as pauses and sleep drift stand out.
+
+        push only scrolls the surface and draws the one new column.  The whole widget is only rendered again
+        when the vertical scale has to change.
+
+        :param color: (r, g, b) color of a column
+        :param stall_color: (r, g, b) color of a column pushed with stalled=True, default is color
+        :param background: (r, g, b) background color
+        :return:
+        """
+
+        super(SparklineWidget, self).__init__(use_surface=True)
+
+        self.color = color
+        self.stall_color = stall_color if stall_color else color
+        self.background = background
+
+        self.history = None  # RingBuffer of (low, high, stalled) columns, created once the width is known
+        self.scale = 1.0  # value drawn at the top of the widget
+        self.pushed = 0  # columns pushed since the scale was last fitted
+
+    def on_fit(self):
+        width = int(self.layout.size.x)
+        self.history = [RingBuffer(width), RingBuffer(width), RingBuffer(width)]
+
+    def push(self, low, high, stalled=False):
+        """
+        Add a column to the right of the sparkline, scrolling the rest to the left.
+
+        :param low: `float` lowest value during the update
+        :param high: `float` highest value during the update
+        :param stalled: `bool` draw the column in the stall_color
+        :return: None
+        """
+
+        if self.history is None:
+            return
+
+        for ring, value in zip(self.history, (low, high, 1.0 if stalled else 0.0)):
+            ring.append(value)
+
+        self.pushed += 1
+        if high > self.scale or self.pushed >= self.history[0].size:
+            # Out of range, or a whole width has scrolled by, so fit the scale to what is on screen.
+            self.redraw()
+            return
+
+        if self.surface is None or self._dirty:
+            return
+
+        self.surface.scroll(-1, 0)
+        self.draw_column(int(self.layout.size.x) - 1, low, high, stalled)
+
+        # Only tell the parent, this widget does not need to render again
+        if self._redraw_callback:
+            self._redraw_callback(self.layout.global_rect)
+
+    def draw_column(self, x, low, high, stalled):
+        height = int(self.layout.size.y)
+        self.surface.fill(self.background, (x, 0, 1, height))
+
+        top = height - 1 - int(min(high / self.scale, 1.0) * (height - 1))
+        bottom = height - 1 - int(min(low / self.scale, 1.0) * (height - 1))
+        color = self.stall_color if stalled else self.color
+        self.surface.fill(color, (x, top, 1, bottom - top + 1))
+
+    def on_render(self):
+        self.surface.fill(self.background)
+        self.pushed = 0
+        if self.history is None or not len(self.history[0]):
+            return
+
+        lows, highs, stalls = [ring.values() for ring in self.history]
+        self.scale = max(highs) * 1.25 or 1.0
+
+        x = int(self.layout.size.x) - len(lows)
+        for low, high, stalled in zip(lows, highs, stalls):
+            self.draw_column(x, low, high, stalled)
+            x += 1
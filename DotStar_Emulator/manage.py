@@ -5,6 +5,8 @@ import argparse
 
 from DotStar_Emulator.emulator import EmulatorApp
 from DotStar_Emulator.emulator.send_test_data import start_send_test_data_app
+from DotStar_Emulator.emulator.bench import start_bench_app
+from DotStar_Emulator.emulator.bench.end_to_end import parse_grid_size
 
 
 # Main Parser
@@ -14,6 +16,12 @@ sub_parser = parser.add_subparsers()
 # Build Run Arguments
 run_command = sub_parser.add_parser("run", help="run the emulator")
 run_command.set_defaults(cmd="run")
+run_command.add_argument("--headless", dest="headless", action="store_const", const=True, default=False,
+                         help="Run without a window, using the SDL dummy video driver. Throughput is logged.")
+run_command.add_argument("--render", dest="render", action="store_const", const=True, default=False,
+                         help="When headless, still render the scene to an offscreen surface.")
+run_command.add_argument("--metrics-port", dest="metrics_port", action="store", type=int, default=None,
+                         help="Serve Prometheus style metrics on this port, overrides METRICS_PORT.")
 
 # Build Test Arguments
 test_data_command = sub_parser.add_parser("test", help="send test data")
@@ -34,6 +42,37 @@ group.add_argument("--fill", dest="fill", action="store", metavar="color",
 group.add_argument("--image", dest="image", action="store", metavar="filename",
                    help="Load image")
 
+# Build Bench Arguments
+bench_command = sub_parser.add_parser("bench", help="benchmark a headless emulator with synthetic frames")
+bench_command.set_defaults(cmd="bench")
+bench_command.add_argument("--grid", dest="grid", action="append", type=parse_grid_size, default=None,
+                           metavar="COLUMNSxROWS",
+                           help="Grid size to benchmark, can be repeated. Default 8x8, 64x64, 256x256 and 1024x1024")
+bench_command.add_argument("--transport", dest="transport", action="append", default=None,
+                           help="Transport to benchmark, can be repeated. Default all available transports")
+bench_command.add_argument("--duration", dest="duration", action="store", type=float, default=10.0,
+                           help="Seconds to run each grid size and transport. Default 10")
+bench_command.add_argument("--rate", dest="rate", action="store", type=float, default=30.0,
+                           help="Frequency in Hz frames are sent at while measuring latency. Default 30")
+bench_command.add_argument("--output", dest="output", action="store", default=None, metavar="filename",
+                           help="JSON report filename. Default bench.json, or bench_micro.json with --micro")
+bench_command.add_argument("--compare", dest="compare", action="store", default=None, metavar="filename",
+                           help="Baseline JSON report to compare against, exit status is 1 on a regression")
+bench_command.add_argument("--tolerance", dest="tolerance", action="store", type=float, default=0.1,
+                           help="Allowed relative change before a metric is a regression. Default 0.1")
+bench_command.add_argument("--micro", dest="micro", action="store_const", const=True, default=False,
+                           help="Run the micro benchmarks of the hot paths instead of the end to end benchmark")
+bench_command.add_argument("--pixels", dest="pixels", action="append", type=int, default=None,
+                           help="Micro benchmark pixel count, can be repeated. Default 64, 1024 and 16384")
+bench_command.add_argument("--filter", dest="filter", action="store", default=None,
+                           help="Only run the micro benchmarks with this text in their name")
+bench_command.add_argument("--min-time", dest="min_time", action="store", type=float, default=0.2,
+                           help="Minimum seconds each micro benchmark repeat is run for. Default 0.2")
+bench_command.add_argument("--repeat", dest="repeat", action="store", type=int, default=5,
+                           help="Number of times each micro benchmark is repeated, the best is reported. Default 5")
+bench_command.add_argument("--worker", dest="worker", action="store_const", const=True, default=False,
+                           help=argparse.SUPPRESS)
+
 # Build Init Arguments
 init_command = sub_parser.add_parser("init", help="Initialise the working folder with a config and manage.py file.")
 init_command.set_defaults(cmd="init")
@@ -49,7 +88,10 @@ def run(arguments):
     :return: None
     """
 
-    app = EmulatorApp()
+    if arguments.headless:
+        app = EmulatorApp(headless=True, render=arguments.render, metrics_port=arguments.metrics_port)
+    else:
+        app = EmulatorApp(metrics_port=arguments.metrics_port)
     app.run()
 
 
@@ -64,6 +106,17 @@ def send_test_data(arguments):
     start_send_test_data_app(arguments)
 
 
+def bench(arguments):
+    """
+    Benchmark a headless instance of DotStar Emulator
+
+    :param arguments: argparse Namespace
+    :return: None
+    """
+
+    start_bench_app(arguments)
+
+
 def init(arguments):
     """
     Initialize a users folder with a config and manage.py file.
@@ -108,6 +161,8 @@ def manage():
             send_test_data(args)
         if args.cmd == "init":
             init(args)
+        if args.cmd == "bench":
+            bench(args)
     else:
         if 'show_help' in args:
             args.show_help.print_help()
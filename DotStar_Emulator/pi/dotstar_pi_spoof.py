@@ -24,12 +24,12 @@ class DataThread(threading.Thread):
         """
 
         super(DataThread, self).__init__()
-        if os.environ.has_key('DOTSTAR_HOST'):
+        if 'DOTSTAR_HOST' in os.environ:
             self.host = os.environ.get('DOTSTAR_HOST')
         else:
             self.host = HOST
-        if os.environ.has_key('DOTSTAR_PORT'):
-            self.port = os.environ.get('DOTSTAR_PORT')
+        if 'DOTSTAR_PORT' in os.environ:
+            self.port = int(os.environ.get('DOTSTAR_PORT'))
         else:
             self.port = PORT
 
@@ -207,9 +207,9 @@ class Adafruit_DotStar(object):
         out_buffer += data
 
         if self.numLEDs:
-            footerLen = (self.numLEDs + 15) / 16
+            footerLen = (self.numLEDs + 15) // 16
         else:
-            footerLen = ((len(data) / 4) + 15) / 16
+            footerLen = ((len(data) // 4) + 15) // 16
         fBuf = bytearray()
         for i in range(footerLen):
             # This is different than AdaFruit library, which uses zero's in the xfer[2] spi_ioc_transfer struct.
@@ -27,6 +27,7 @@ setup(
         "six",
         "blinker>=1.4",
         "pillow>=2.9.0",
+        "numpy",
     ],
     include_package_data=True,
     license='MIT',